@@ -0,0 +1,129 @@
+import time
+
+FRAME_RATE_HZ = 120
+EASING_TABLE_SIZE = 1024
+
+
+def linear(t):
+    return t
+
+
+def ease_in_out_quad(t):
+    t *= 2
+    if t < 1:
+        return 0.5 * t * t
+    t -= 1
+    return -0.5 * (t * (t - 2) - 1)
+
+
+def ease_out_bounce(t):
+    if t < 1 / 2.75:
+        return 7.5625 * t * t
+    elif t < 2 / 2.75:
+        t -= 1.5 / 2.75
+        return 7.5625 * t * t + 0.75
+    elif t < 2.5 / 2.75:
+        t -= 2.25 / 2.75
+        return 7.5625 * t * t + 0.9375
+    else:
+        t -= 2.625 / 2.75
+        return 7.5625 * t * t + 0.984375
+
+
+EASINGS = {
+    "linear": linear,
+    "ease_in_out_quad": ease_in_out_quad,
+    "ease_out_bounce": ease_out_bounce,
+}
+
+
+class EasingTable:
+    # Precomputed curve sampled at `size` points; lookups interpolate between neighbours
+    def __init__(self, fn, size=EASING_TABLE_SIZE):
+        self.size = size
+        self.values = [fn(i / (size - 1)) for i in range(size)]
+
+    def __call__(self, t):
+        if t <= 0.0:
+            return self.values[0]
+        if t >= 1.0:
+            return self.values[-1]
+        position = t * (self.size - 1)
+        index = int(position)
+        low = self.values[index]
+        return low + (self.values[index + 1] - low) * (position - index)
+
+
+_tables = {}
+
+
+def easing_table(name):
+    table = _tables.get(name)
+    if table is None:
+        table = _tables[name] = EasingTable(EASINGS.get(name, linear))
+    return table
+
+
+class AnimationResult:
+    __slots__ = ("planned", "actual", "frames", "skipped", "completed")
+
+    def __init__(self, planned, actual, frames, skipped, completed):
+        self.planned = planned
+        self.actual = actual
+        self.frames = frames
+        self.skipped = skipped
+        self.completed = completed
+
+    @property
+    def overrun(self):
+        return self.actual - self.planned
+
+    def as_dict(self):
+        return {
+            "planned": self.planned,
+            "actual": self.actual,
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "completed": self.completed,
+        }
+
+    def __str__(self):
+        return (f"{self.frames} frames ({self.skipped} skipped) in {self.actual * 1000:.1f} ms, "
+                f"planned {self.planned * 1000:.1f} ms")
+
+
+class FrameAnimator:
+    # The value for each frame comes from elapsed perf_counter time, not a frame count, so a late
+    # sleep costs smoothness but never stretches the transition; frames whose deadline already
+    # passed are skipped instead of written back to back.
+    def __init__(self, rate_hz=FRAME_RATE_HZ):
+        self.rate_hz = rate_hz
+
+    def run(self, start_value, end_value, duration, easing, write, keep_going=None):
+        ease = easing_table(easing) if isinstance(easing, str) else easing
+        period = 1.0 / self.rate_hz
+        started = time.perf_counter()
+        frames = skipped = 0
+        frame = 0
+        while True:
+            if keep_going is not None and not keep_going():
+                return AnimationResult(duration, time.perf_counter() - started, frames, skipped, False)
+            elapsed = time.perf_counter() - started
+            t = elapsed / duration if duration > 0 else 1.0
+            if t >= 1.0:
+                write(end_value)
+                frames += 1
+                return AnimationResult(duration, time.perf_counter() - started, frames, skipped, True)
+            write(start_value + (end_value - start_value) * ease(t))
+            frames += 1
+
+            frame += 1
+            now = time.perf_counter()
+            due = int((now - started) / period) + 1
+            if due > frame:
+                skipped += due - frame
+                frame = due
+            deadline = min(started + frame * period, started + duration)
+            remaining = deadline - now
+            if remaining > 0:
+                time.sleep(remaining)
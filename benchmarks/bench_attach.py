@@ -0,0 +1,349 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simprocess
+from bench_scanner import git_revision
+from synthetic import MB, build_heap_regions, build_module_image
+from cancellation import CancellationToken
+from config import ConfigManager
+from relocate import SignatureRelocator
+from snapshot import Snapshot
+from version_detector import MinecraftVersionDetector
+
+PHASES = ("scan", "alloc", "patch", "verify", "wait", "other")
+
+# Method name prefix -> phase; the first match wins, everything else runs in its caller's phase
+PHASE_RULES = (
+    ("allocate_near", "alloc"),
+    ("validate_", "verify"),
+    ("find_", "scan"),
+    ("scan_", "scan"),
+    ("enable_", "patch"),
+    ("_write_", "patch"),
+    ("apply_", "patch"),
+    ("start", "patch"),
+    ("initialize", "other"),
+)
+
+# Controllers whose start() only installs memory patches; zoom/brightness/sprint also hook the keyboard
+DEFAULT_FEATURES = ("antiknockback", "reach", "hitbox", "speed", "coordinates", "truesight", "timechanger",
+                    "fastitem", "nohurtcam")
+
+CONTROLLERS = (
+    ("antikb_controller", "module.antiknockback", "AntiKnockbackController", "antiknockback"),
+    ("reach_controller", "module.reach", "ReachController", "reach"),
+    ("hitbox_controller", "module.hitbox", "HitboxController", "hitbox"),
+    ("zoom_controller", "module.zoom", "ZoomController", "zoom"),
+    ("brightness_controller", "module.brightness", "BrightnessController", "brightness"),
+    ("speed_controller", "module.speed", "SpeedController", "speed"),
+    ("coordinates_controller", "module.coordinates", "CoordinatesController", "coordinates"),
+    ("sprint_controller", "module.sprint", "SprintController", "sprint"),
+    ("truesight_controller", "module.truesight", "TrueSightController", "truesight"),
+    ("timechanger_controller", "module.timechanger", "TimeChangerController", "timechanger"),
+    ("fastitem_controller", "module.fastitem", "FastItemController", "fastitem"),
+    ("nohurtcam_controller", "module.nohurtcam", "NoHurtCamController", "nohurtcam"),
+)
+VERSIONED = ("hitbox_controller", "speed_controller")
+
+
+class PhaseClock:
+    # Exclusive time per (controller, phase): entering a nested phase pauses the enclosing one
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(Counter)
+        self._stack = []
+
+    def _owner(self):
+        return self._stack[-1][0] if self._stack else "backend"
+
+    def push(self, controller, phase):
+        now = time.perf_counter()
+        if self._stack:
+            top = self._stack[-1]
+            self.totals[(top[0], top[1])] += now - top[2]
+        self._stack.append([controller, phase, now])
+
+    def pop(self):
+        now = time.perf_counter()
+        controller, phase, start = self._stack.pop()
+        self.totals[(controller, phase)] += now - start
+        if self._stack:
+            self._stack[-1][2] = now
+
+    def count(self, api):
+        if threading.get_ident() == self.thread:
+            self.calls[self._owner()][api] += 1
+
+    def wrap(self, controller, phase, fn):
+        def timed(*args, **kwargs):
+            if threading.get_ident() != self.thread:
+                return fn(*args, **kwargs)
+            self.push(controller, phase)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.pop()
+        return timed
+
+    def current(self):
+        return self._owner()
+
+
+class TimedCancellationToken(CancellationToken):
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def wait(self, timeout):
+        if threading.get_ident() != self.clock.thread:
+            return super().wait(timeout)
+        self.clock.push(self.clock.current(), "wait")
+        try:
+            return super().wait(timeout)
+        finally:
+            self.clock.pop()
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events = []
+
+    def put(self, item, block=True, timeout=None):
+        self.events.append((time.perf_counter() - self.started, item))
+
+    put_nowait = put
+
+    def first(self, kind, value=None):
+        for at, item in self.events:
+            if item[0] == kind and (value is None or item[1] == value):
+                return at
+        return None
+
+
+class PassiveModule:
+    # Stand-in for the non-memory modules (autoclicker, stream protect, tray); they only receive the queue
+    def set_update_queue(self, update_queue):
+        self.update_queue = update_queue
+
+
+def phase_for(method_name):
+    for prefix, phase in PHASE_RULES:
+        if method_name.startswith(prefix):
+            return phase
+    return None
+
+
+def instrument(clock, name, controller):
+    for attr in dir(type(controller)):
+        phase = phase_for(attr)
+        if phase is None or attr.startswith("__"):
+            continue
+        method = getattr(controller, attr)
+        if callable(method):
+            setattr(controller, attr, clock.wrap(name, phase, method))
+
+
+def make_host(controllers, config, series, version_config):
+    from gui import MinecraftModApp
+
+    # Only the backend sequence is borrowed from the app; no Tk window is ever created
+    class HeadlessHost:
+        _initialize_backend = MinecraftModApp._initialize_backend
+        _on_init_cancelled = MinecraftModApp._on_init_cancelled
+
+    host = HeadlessHost()
+    host.update_queue = RecordingQueue()
+    host.config = config
+    host.minecraft_version = series
+    host.version_config = version_config
+    host.game_process = None
+    host._process_watcher = None
+    host._init_cancel_token = None
+    host._is_closing = False
+    host.attach_times = {}
+    for attr, controller in controllers.items():
+        setattr(host, attr, controller)
+    for attr in ("autoclicker_controller", "streamprotect_controller", "systemtray_controller"):
+        setattr(host, attr, PassiveModule())
+    return host
+
+
+def run_once(make_process, args, workdir):
+    import importlib
+
+    series = args.series
+    version_config = MinecraftVersionDetector.SUPPORTED_VERSION_SERIES[series]
+    config = ConfigManager(os.path.join(workdir, "config.json"))
+    for feature in config.config["feature_states"]:
+        config.config["feature_states"][feature] = feature in args.features
+    ConfigManager._shared_instance = config
+    SignatureRelocator._shared_instance = SignatureRelocator(os.path.join(workdir, "signature_cache.json"))
+
+    process = make_process()
+    clock = PhaseClock()
+    process.observer = clock.count
+    with simprocess.install(process):
+        controllers = {}
+        for attr, module_name, class_name, label in CONTROLLERS:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            controller = cls(version_config=version_config) if attr in VERSIONED else cls()
+            instrument(clock, label, controller)
+            controllers[attr] = controller
+
+        host = make_host(controllers, config, series, version_config)
+        token = TimedCancellationToken(clock)
+        host._init_cancel_token = token
+        host.update_queue.started = start = time.perf_counter()
+        host._initialize_backend(token)
+        time_to_ready = time.perf_counter() - start
+        initialized = {attr: bool(getattr(controller, "initialized", False)) for attr, controller in controllers.items()}
+        events = list(host.update_queue.events)
+
+        if host._process_watcher:
+            host._process_watcher.stop()
+        token.cancel()
+        for controller in controllers.values():
+            try:
+                controller.reset_to_default(is_app_closing=True)
+            except Exception:
+                pass
+        process.exit()
+
+    statuses = {}
+    for _, item in events:
+        if item[0] == "status_update":
+            feature, message, _ = item[1]
+            statuses[feature] = message
+
+    per_controller = {}
+    for attr, _, _, label in CONTROLLERS:
+        phases = {phase: clock.totals.get((label, phase), 0.0) for phase in PHASES}
+        if not any(phases.values()):
+            continue
+        per_controller[label] = {
+            "total": sum(phases.values()),
+            "phases": phases,
+            "initialized": initialized[attr],
+            "syscalls": dict(clock.calls.get(label, {})),
+            "status": statuses.get(label),
+        }
+    backend = {phase: clock.totals.get(("backend", phase), 0.0) for phase in PHASES}
+    return {
+        "time_to_ready": time_to_ready,
+        "init_complete_at": host.update_queue.first("init_complete", True),
+        "backend": backend,
+        "controllers": per_controller,
+        "syscalls": dict(process.calls),
+        "bytes_read": process.bytes_read,
+    }
+
+
+def print_run(result):
+    header = f"{'controller':<14}{'total':>10}" + "".join(f"{phase:>9}" for phase in PHASES) + f"{'syscalls':>10}  status"
+    print(header)
+    for label, info in sorted(result["controllers"].items(), key=lambda kv: -kv[1]["total"]):
+        cells = "".join(f"{info['phases'][phase] * 1000:9.1f}" for phase in PHASES)
+        calls = sum(info["syscalls"].values())
+        mark = "" if info["initialized"] else "  (not initialized)"
+        print(f"{label:<14}{info['total'] * 1000:10.1f}{cells}{calls:>10}  {info['status'] or '-'}{mark}")
+    backend = result["backend"]
+    cells = "".join(f"{backend[phase] * 1000:9.1f}" for phase in PHASES)
+    print(f"{'backend':<14}{sum(backend.values()) * 1000:10.1f}{cells}")
+    complete = result["init_complete_at"]
+    complete_text = f"{complete * 1000:.1f} ms" if complete is not None else "never"
+    print(f"time-to-ready {result['time_to_ready'] * 1000:.1f} ms  init_complete {complete_text}  "
+          f"{result['bytes_read'] / MB:.1f} MB read, {sum(result['syscalls'].values())} syscalls")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless attach: the real backend init sequence against a simulated game process")
+    parser.add_argument("--module-mb", type=int, default=128)
+    parser.add_argument("--heap-mb", type=int, default=256)
+    parser.add_argument("--series", choices=sorted(MinecraftVersionDetector.SUPPORTED_VERSION_SERIES),
+                        help="default: the snapshot's series, else 1.21.13")
+    parser.add_argument("--features", default=",".join(DEFAULT_FEATURES), help="features enabled in the temporary config")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--syscall-us", type=float, default=0.0, help="added cost per simulated API call")
+    parser.add_argument("--read-gbps", type=float, default=0.0, help="simulated ReadProcessMemory bandwidth (0 = memcpy)")
+    parser.add_argument("--snapshot", help="replay a capture from snapshot.py instead of the synthetic process")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="earlier --json output to compare time-to-ready against")
+    args = parser.parse_args()
+    args.features = set(filter(None, args.features.split(",")))
+
+    if args.snapshot:
+        snap = Snapshot(args.snapshot)
+        args.series = args.series or snap.metadata.get("series") or "1.21.13"
+        print(f"Replaying {args.snapshot}: {snap.summary()}")
+
+        # Writes land in per-run copies of the touched chunks, so every run sees the captured bytes
+        def make_process():
+            return simprocess.SnapshotBackend(snap, syscall_us=args.syscall_us, read_gbps=args.read_gbps)
+    else:
+        args.series = args.series or "1.21.13"
+        image = build_module_image(args.module_mb * MB, seed=args.seed, series=args.series)
+        heap = build_heap_regions(args.heap_mb * MB, seed=args.seed, series=args.series)
+        pristine = bytes(image.data)
+
+        def make_process():
+            # Hooks patch the image; every run starts from the unpatched bytes
+            image.data[:] = pristine
+            return simprocess.SimulatedProcess(image, heap, syscall_us=args.syscall_us, read_gbps=args.read_gbps)
+
+    runs = []
+    for i in range(args.repeat):
+        with tempfile.TemporaryDirectory() as workdir:
+            result = run_once(make_process, args, workdir)
+        print(f"\nrun {i + 1}/{args.repeat}")
+        print_run(result)
+        runs.append(result)
+
+    best = min(runs, key=lambda r: r["time_to_ready"])
+    print(f"\nbest time-to-ready {best['time_to_ready'] * 1000:.1f} ms over {len(runs)} run(s)")
+
+    if args.json:
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "series": args.series,
+                "module_mb": args.module_mb,
+                "heap_mb": args.heap_mb,
+                "snapshot": args.snapshot,
+                "features": sorted(args.features),
+                "syscall_us": args.syscall_us,
+                "read_gbps": args.read_gbps,
+                "seed": args.seed,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "time_to_ready": best["time_to_ready"],
+            "runs": runs,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(runs)} runs to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        old = baseline["time_to_ready"]
+        print(f"vs {args.baseline} ({baseline['meta'].get('revision')}): "
+              f"{old * 1000:.1f} ms -> {best['time_to_ready'] * 1000:.1f} ms ({best['time_to_ready'] / old:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+import argparse
+import bisect
+import ctypes
+import json
+import os
+import platform
+import re
+import struct
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from heapscan import HeapRegion, RegionReader
+from pipeline import first, float_values, in_range
+from scanner import SignatureScanner, load_signatures
+from relocate import fuzzy_search, np
+from synthetic import MB, build_heap_regions, build_module_image
+
+MODULE_STRATEGIES = ("anchor", "anchor_first", "anchor_unique", "horspool", "regex", "multi", "fuzzy")
+HEAP_STRATEGIES = ("heap_anchor", "heap_read", "heap_stream", "heap_regex")
+
+# Float ranges the controllers accept for the value in front of each heap pattern
+HEAP_RANGES = {
+    "zoom.fov": (30.0, 110.0),
+    "brightness.gamma": (0.0, 10.0),
+}
+
+
+def regex_for(signature):
+    # Reference for the pre-database scanners: one compiled regex per pattern, '.' for wildcards
+    parts = [re.escape(bytes([b])) if literal else b"." for b, literal in zip(signature.pattern, signature.mask)]
+    return re.compile(b"".join(parts), re.DOTALL)
+
+
+def measure(fn, repeat, trace=True, peak_fn=None):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    if not trace:
+        return best, 0, result
+    # Separate run: tracemalloc slows allocation-heavy strategies far more than it would the timed ones
+    tracemalloc.start()
+    try:
+        (peak_fn or fn)()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def row(dataset, strategy, signature, scanned, seconds, peak, matches, expected, first_seconds=None):
+    # first_seconds: time until the first result is in hand; eager strategies only have one after the full run
+    first_seconds = seconds if first_seconds is None else first_seconds
+    mb_s = scanned / MB / seconds if seconds else 0.0
+    ok = sorted(matches) == sorted(expected)
+    print(f"{dataset:<14} {strategy:<13} {signature:<20} {mb_s:10.1f} MB/s  {seconds * 1000:9.2f} ms  "
+          f"first {first_seconds * 1000:9.2f} ms  peak {peak / 1024:8.1f} KB  {len(matches):>3} matches{'' if ok else '  MISMATCH'}")
+    return {
+        "dataset": dataset,
+        "strategy": strategy,
+        "signature": signature,
+        "bytes": scanned,
+        "seconds": seconds,
+        "first_seconds": first_seconds,
+        "mb_s": mb_s,
+        "peak_bytes": peak,
+        "matches": len(matches),
+        "expected": len(expected),
+        "ok": ok,
+    }
+
+
+def bench_module(size_mb, args):
+    image = build_module_image(size_mb * MB, seed=args.seed, series=args.series)
+    data = image.data
+    dataset = f"module-{size_mb}MB"
+    signatures = _selected(image.planted, args)
+    results = []
+
+    for name, sig in sorted(signatures.items()):
+        expected = [image.planted[name]]
+        if "anchor" in args.strategies:
+            seconds, peak, matches = measure(lambda: sig.scan(data), args.repeat, args.peak)
+            results.append(row(dataset, "anchor", name, len(data), seconds, peak, matches, expected))
+        if "anchor_first" in args.strategies:
+            seconds, peak, matches = measure(lambda: sig.scan(data, limit=1), args.repeat, args.peak)
+            scanned = (matches[0] + sig.length) if matches else len(data)
+            results.append(row(dataset, "anchor_first", name, scanned, seconds, peak, matches, expected))
+        if "anchor_unique" in args.strategies:
+            # The relocator's uniqueness mode: the first match, then a scan on for a second one
+            seconds, peak, match = measure(lambda: first(sig.iter_matches(data), unique=True), args.repeat, args.peak)
+            results.append(row(dataset, "anchor_unique", name, len(data), seconds, peak, [match], expected))
+        if "horspool" in args.strategies:
+            # Pure Python: only a prefix is scanned, MB/s stays comparable; its peak does not grow with input
+            end = min(len(data), args.horspool_mb * MB)
+            seconds, peak, matches = measure(lambda: sig.scan_horspool(data, end=end), 1, args.peak,
+                                           lambda: sig.scan_horspool(data, end=min(end, MB)))
+            prefix_expected = [offset for offset in expected if offset + sig.length <= end]
+            results.append(row(dataset, "horspool", name, end, seconds, peak, matches, prefix_expected))
+        if "regex" in args.strategies:
+            pattern = regex_for(sig)
+            seconds, peak, matches = measure(lambda: [m.start() for m in pattern.finditer(data)], args.repeat, args.peak)
+            results.append(row(dataset, "regex", name, len(data), seconds, peak, matches, expected))
+        if "fuzzy" in args.strategies:
+            def relocate():
+                candidates, _ = fuzzy_search(data, sig, budget=args.fuzzy_budget)
+                return [c.offset for c in candidates if c.distance == 0]
+            seconds, peak, matches = measure(relocate, 1, args.peak)
+            results.append(row(dataset, "fuzzy", name, len(data), seconds, peak, matches, expected))
+
+    if "multi" in args.strategies:
+        scanner = SignatureScanner(signatures)
+        seconds, peak, found = measure(lambda: scanner.resolve(data, limit=1), args.repeat, args.peak)
+        matches = [offsets[0] for offsets in found.values() if offsets]
+        expected = [image.planted[name] for name in signatures]
+        results.append(row(dataset, "multi", f"{len(signatures)} signatures", len(data) * len(signatures),
+                           seconds, peak, matches, expected))
+    return results
+
+
+def _selected(planted, args):
+    signatures = load_signatures(args.series)
+    names = [name for name in planted if not args.signatures or name in args.signatures]
+    return {name: signatures[name] for name in names}
+
+
+def _heap_filter(name, region, offsets):
+    low, high = HEAP_RANGES.get(name, (float("-inf"), float("inf")))
+    hits = []
+    for offset in offsets:
+        value = struct.unpack_from("<f", region.data, offset)[0]
+        if low <= value <= high:
+            hits.append(region.base + offset)
+    return hits
+
+
+def _region_read(heap):
+    # ReadProcessMemory stand-in over the synthetic regions: copies into the caller's buffer
+    bases = [region.base for region in heap.regions]
+    sources = [ctypes.addressof((ctypes.c_char * region.size).from_buffer(region.data)) for region in heap.regions]
+
+    def read(handle, address, buffer, size, count):
+        address, size = address.value, size.value
+        index = bisect.bisect_right(bases, address) - 1
+        ctypes.memmove(buffer.value, sources[index] + address - bases[index], size)
+        count._obj.value = size
+        return 1
+    return read
+
+
+def bench_heap(size_mb, args):
+    heap = build_heap_regions(size_mb * MB, seed=args.seed, series=args.series)
+    dataset = f"heap-{size_mb}MB"
+    results = []
+    for name, sig in sorted(_selected(heap.planted, args).items()):
+        expected = [heap.planted[name]]
+        if "heap_anchor" in args.strategies:
+            # Same shape as the zoom/brightness walk: every region, every match, then the float range check
+            def walk():
+                hits = []
+                for region in heap.regions:
+                    hits.extend(_heap_filter(name, region, sig.iter_matches(region.data)))
+                return hits
+            seconds, peak, matches = measure(walk, args.repeat, args.peak)
+            results.append(row(dataset, "heap_anchor", name, heap.size, seconds, peak, matches, expected))
+        if "heap_read" in args.strategies:
+            # The pre-streaming controllers: one read_bytes copy the size of each region
+            def walk_read():
+                hits = []
+                for region in heap.regions:
+                    memory = bytes(region.data)
+                    hits.extend(_heap_filter(name, region, sig.iter_matches(memory)))
+                return hits
+            seconds, peak, matches = measure(walk_read, args.repeat, args.peak)
+            results.append(row(dataset, "heap_read", name, heap.size, seconds, peak, matches, expected))
+        if "heap_stream" in args.strategies:
+            # What the controllers do now: fixed windows into one reused buffer
+            reader = RegionReader(_region_read(heap))
+            regions = [HeapRegion(region.base, region.size, region.base) for region in heap.regions]
+            low, high = HEAP_RANGES.get(name, (float("-inf"), float("inf")))
+            def stream():
+                return in_range(float_values(reader.scan(0, regions, sig), reader.buffer), low, high)
+            seconds, peak, matches = measure(lambda: [address for address, _ in stream()], args.repeat, args.peak)
+            first_seconds, _, _ = measure(lambda: first(stream()), args.repeat, trace=False)
+            results.append(row(dataset, "heap_stream", name, heap.size, seconds, peak, matches, expected, first_seconds))
+        if "heap_regex" in args.strategies:
+            pattern = regex_for(sig)
+            def walk_regex():
+                hits = []
+                for region in heap.regions:
+                    hits.extend(_heap_filter(name, region, (m.start() for m in pattern.finditer(region.data))))
+                return hits
+            seconds, peak, matches = measure(walk_regex, args.repeat, args.peak)
+            results.append(row(dataset, "heap_regex", name, heap.size, seconds, peak, matches, expected))
+    return results
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["dataset"], r["strategy"], r["signature"]): r for r in baseline.get("results", [])}
+    regressions = 0
+    print(f"\nAgainst {baseline_path} ({baseline.get('meta', {}).get('revision')})")
+    for result in results:
+        old = previous.get((result["dataset"], result["strategy"], result["signature"]))
+        if not old or not old["mb_s"]:
+            continue
+        ratio = result["mb_s"] / old["mb_s"]
+        if ratio < 1.0 - tolerance:
+            regressions += 1
+            flag = "  REGRESSION"
+        else:
+            flag = ""
+        print(f"{result['dataset']:<14} {result['strategy']:<13} {result['signature']:<20} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan throughput over synthetic module images and heap regions")
+    parser.add_argument("--sizes", default="100,512", help="module image sizes in MB (up to 2048)")
+    parser.add_argument("--heap-sizes", default="100,512", help="total heap sizes in MB (up to 2048)")
+    parser.add_argument("--strategies", default=",".join(MODULE_STRATEGIES + HEAP_STRATEGIES))
+    parser.add_argument("--signatures", default="", help="comma-separated signature names (default: all planted)")
+    parser.add_argument("--series", default="1.21.13")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--horspool-mb", type=int, default=4, help="prefix scanned by the pure-Python strategy")
+    parser.add_argument("--fuzzy-budget", type=float, default=5.0)
+    parser.add_argument("--no-peak", dest="peak", action="store_false", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="earlier --json output to compare MB/s against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+    args.strategies = set(filter(None, args.strategies.split(",")))
+    args.signatures = set(filter(None, args.signatures.split(",")))
+
+    results = []
+    if args.strategies & set(MODULE_STRATEGIES):
+        for size_mb in (int(s) for s in args.sizes.split(",") if s):
+            results.extend(bench_module(size_mb, args))
+    if args.strategies & set(HEAP_STRATEGIES):
+        for size_mb in (int(s) for s in args.heap_sizes.split(",") if s):
+            results.extend(bench_heap(size_mb, args))
+
+    failures = sum(1 for r in results if not r["ok"])
+    if args.json:
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "numpy": np.__version__ if np is not None else None,
+                "series": args.series,
+                "seed": args.seed,
+                "repeat": args.repeat,
+                "peak_traced": args.peak,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.json}")
+
+    regressions = compare(results, args.baseline, args.tolerance) if args.baseline else 0
+    if failures:
+        print(f"{failures} result(s) did not find exactly the planted sites")
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
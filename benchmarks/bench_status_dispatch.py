@@ -0,0 +1,125 @@
+import argparse
+import os
+import queue
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui_dispatch import StatusRegistry, CoalescingQueue
+
+FEATURE_TABS = {
+    "antiknockback": "Movement",
+    "reach": "Combat",
+    "hitbox": "Combat",
+    "zoom": "Visual",
+    "brightness": "Visual",
+    "speed": "Movement",
+    "coordinates": "Visual",
+    "autoclicker": "Combat",
+    "sprint": "Movement",
+    "nohurtcam": "Visual",
+    "truesight": "Visual",
+    "timechanger": "Visual",
+    "fastitem": "Player",
+    "systemtray": "Misc",
+    "streamprotect": "Misc",
+}
+
+MESSAGES = [
+    ("Active", '#00e676'),
+    ("Inactive", '#b0b0b0'),
+    ("Initialized & Ready", '#00e676'),
+    ("Pattern/Memory Init Failed", '#ff5252'),
+]
+
+
+class FakeWidget:
+    def __init__(self):
+        self.calls = 0
+
+    def configure(self, **kwargs):
+        self.calls += 1
+
+    def select(self):
+        self.calls += 1
+
+    def deselect(self):
+        self.calls += 1
+
+
+def build_widgets():
+    widgets = {"Visual": {}, "Combat": {}, "Movement": {}, "Misc": {}, "Player": {}}
+    registry = StatusRegistry()
+    for feature, tab in FEATURE_TABS.items():
+        status, switch = FakeWidget(), FakeWidget()
+        widgets[tab][feature] = {"status": status, "switch": switch}
+        registry.register(feature, status, switch, deselect_on_reset=feature == "streamprotect")
+    return widgets, registry
+
+
+def legacy_dispatch(widgets, feature_name, message, color):
+    # Mirrors the old elif chain in process_queue: one string compare per feature until a hit
+    for feature, tab in FEATURE_TABS.items():
+        if feature_name == feature and feature_name in widgets[tab]:
+            widgets[tab][feature_name]["status"].configure(text=message, text_color=color)
+            if message == "Inactive" or (feature == "streamprotect" and message.startswith("Reset")):
+                widgets[tab][feature_name]["switch"].deselect()
+            elif message.startswith("Active"):
+                widgets[tab][feature_name]["switch"].select()
+            return
+
+
+def make_events(count, seed):
+    rng = random.Random(seed)
+    features = list(FEATURE_TABS)
+    return [('status_update', (rng.choice(features),) + rng.choice(MESSAGES)) for _ in range(count)]
+
+
+def drain(update_queue, handler):
+    handled = 0
+    try:
+        while True:
+            item = update_queue.get_nowait()
+            if item[0] == 'status_update':
+                handler(*item[1])
+                handled += 1
+    except queue.Empty:
+        pass
+    return handled
+
+
+def run(name, events, handler, repeat, queue_factory=queue.Queue):
+    best = None
+    for _ in range(repeat):
+        update_queue = queue_factory()
+        start = time.perf_counter()
+        for event in events:
+            update_queue.put(event)
+        handled = drain(update_queue, handler)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    # Rate is against the events produced, so coalesced runs get credit for the work they skip
+    produced = len(events)
+    print(f"{name:<10} {handled:>8} handled  {best * 1000:8.2f} ms  {produced / best:12.0f} events/s  {best / produced * 1e6:6.2f} us/event")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Put + drain throughput for status_update dispatch")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    widgets, registry = build_widgets()
+    events = make_events(args.events, args.seed)
+    legacy = run("elif", events, lambda f, m, c: legacy_dispatch(widgets, f, m, c), args.repeat)
+    table = run("registry", events, registry.dispatch, args.repeat)
+    coalesced = run("coalesced", events, registry.dispatch, args.repeat, CoalescingQueue)
+    print(f"speedup    registry {legacy / table:.2f}x  coalesced {legacy / coalesced:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import platform
+import struct
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relocate import np
+from synthetic import MB, build_heap_regions
+from valuescan import BufferSource, ValueScanner
+
+# (FOV written before the step, scan run after it); the zoom key is pressed, held, released, then the value is confirmed
+SCRIPT = (
+    (70.0, ("unknown",)),
+    (30.0, ("decreased",)),
+    (30.0, ("unchanged",)),
+    (70.0, ("increased",)),
+    (70.0, ("equal", 70.0)),
+)
+
+
+def churn(arrays, rng, fraction):
+    # Everything else in the heap keeps moving between scans: rewrite a fraction of the dwords
+    for words in arrays:
+        count = int(len(words) * fraction)
+        if count:
+            words[rng.integers(0, len(words), count)] = rng.integers(0, 1 << 32, count, dtype=np.uint32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Candidate narrowing of the value scanner over a synthetic heap")
+    parser.add_argument("--heap-mb", type=int, default=512)
+    parser.add_argument("--series", default="1.21.13")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--churn", type=float, default=0.002, help="fraction of dwords rewritten between scans")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    if np is None:
+        print("numpy is required")
+        return 1
+
+    heap = build_heap_regions(args.heap_mb * MB, seed=args.seed, series=args.series)
+    target = heap.planted["zoom.fov"]
+    owner = next(region for region in heap.regions if region.base <= target < region.base + region.size)
+    source = BufferSource([(region.base, region.data) for region in heap.regions])
+    words = [np.frombuffer(region.data, dtype=np.uint32) for region in heap.regions]
+    rng = np.random.default_rng(args.seed)
+
+    scanner = ValueScanner("float")
+    results = []
+    print(f"{args.heap_mb} MB heap in {len(heap.regions)} regions, target 0x{target:X}")
+    tracemalloc.start()
+    for step_index, (fov, command) in enumerate(SCRIPT):
+        if step_index:
+            churn(words, rng, args.churn)
+        struct.pack_into("<f", owner.data, target - owner.base, fov)
+        tracemalloc.reset_peak()
+        if scanner.started:
+            step = scanner.next_scan(source, *command)
+        else:
+            step = scanner.first_scan(source, *command)
+        peak = tracemalloc.get_traced_memory()[1]
+        kept = any(address == target for address, _ in scanner.addresses(limit=1000))
+        print(f"{step}  peak {peak / MB:8.1f} MB  candidates {scanner.memory_bytes() / MB:8.1f} MB"
+              f"{'' if kept or step.after > 1000 else '  TARGET LOST'}")
+        results.append(dict(step.as_dict(), peak=peak, candidate_bytes=scanner.memory_bytes()))
+    tracemalloc.stop()
+    found = [address for address, _ in scanner.addresses(limit=20)]
+    print(f"{len(found)} left: {', '.join(f'0x{address:X}' for address in found)}")
+
+    if args.json:
+        report = {
+            "meta": {
+                "heap_mb": args.heap_mb,
+                "series": args.series,
+                "seed": args.seed,
+                "churn": args.churn,
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "steps": results,
+            "found": [f"0x{address:X}" for address in found],
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {len(results)} steps to {args.json}")
+    return 0 if target in found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+import bisect
+import ctypes
+import struct
+import threading
+import time
+import types
+from collections import Counter
+from contextlib import contextmanager
+
+PROCESS_NAME = "Minecraft.Windows.exe"
+MODULE_BASE = 0x7FF600000000
+PROCESS_HANDLE = 0x1D4
+STILL_ACTIVE = 259
+WAIT_TIMEOUT = 0x102
+WAIT_OBJECT_0 = 0x0
+
+MEM_COMMIT = 0x1000
+MEM_FREE = 0x10000
+MEM_PRIVATE = 0x20000
+MEM_IMAGE = 0x1000000
+PAGE_NOACCESS = 0x01
+PAGE_READONLY = 0x02
+PAGE_READWRITE = 0x04
+PAGE_EXECUTE_READ = 0x20
+PAGE_EXECUTE_READWRITE = 0x40
+ALLOCATION_GRANULARITY = 0x10000
+PAGE_SIZE = 0x1000
+USER_SPACE_END = 0x7FFFFFFF0000
+
+
+class SimMemoryError(OSError):
+    pass
+
+
+class Region:
+    __slots__ = ("base", "data", "protect", "type")
+
+    def __init__(self, base, data, protect, type):
+        self.base = base
+        self.data = data
+        self.protect = protect
+        self.type = type
+
+    @property
+    def end(self):
+        return self.base + len(self.data)
+
+
+def _value(arg):
+    # Controllers pass ints, None or ctypes wrappers such as c_void_p(addr)
+    if arg is None:
+        return 0
+    return getattr(arg, "value", arg) or 0
+
+
+def _target(ref):
+    return getattr(ref, "_obj", ref)
+
+
+# Address space of a fake game process: one module image, heap regions and hook allocations
+class SimulatedProcess:
+    def __init__(self, image, heap=None, syscall_us=0.0, read_gbps=0.0):
+        self.image = image
+        self._setup(syscall_us, read_gbps)
+
+        # Each PE section is its own region, the way VirtualQueryEx reports a mapped image
+        self.module_base = MODULE_BASE
+        self.module_size = len(image.data)
+        view = memoryview(image.data)
+        header_end = image.sections[0][1] if image.sections else len(image.data)
+        self._map(Region(MODULE_BASE, view[:header_end], PAGE_READONLY, MEM_IMAGE))
+        for name, rva, size, characteristics in image.sections:
+            protect = PAGE_EXECUTE_READ if characteristics & 0x20000000 else (
+                PAGE_READWRITE if characteristics & 0x80000000 else PAGE_READONLY)
+            self._map(Region(MODULE_BASE + rva, view[rva:rva + size], protect, MEM_IMAGE))
+        for region in (heap.regions if heap else ()):
+            self._map(Region(region.base, region.data, PAGE_READWRITE, MEM_PRIVATE))
+
+    def _setup(self, syscall_us, read_gbps):
+        self.syscall_cost = syscall_us / 1e6
+        self.read_cost = 1.0 / (read_gbps * 1e9) if read_gbps else 0.0
+        self.alive = threading.Event()
+        self.alive.set()
+        self.calls = Counter()
+        self.bytes_read = 0
+        self.observer = None
+        self._lock = threading.RLock()
+        self._regions = []
+        self._bases = []
+
+    def _map(self, region):
+        index = bisect.bisect_left(self._bases, region.base)
+        self._bases.insert(index, region.base)
+        self._regions.insert(index, region)
+
+    def _unmap(self, base):
+        index = bisect.bisect_left(self._bases, base)
+        if index < len(self._bases) and self._bases[index] == base:
+            del self._bases[index]
+            del self._regions[index]
+            return True
+        return False
+
+    def _charge(self, api, size=0):
+        self.calls[api] += 1
+        if self.observer is not None:
+            self.observer(api)
+        cost = self.syscall_cost + size * self.read_cost
+        if cost:
+            # Spin: sleep() cannot resolve microseconds on Windows
+            deadline = time.perf_counter() + cost
+            while time.perf_counter() < deadline:
+                pass
+
+    def region_at(self, address):
+        index = bisect.bisect_right(self._bases, address) - 1
+        if index >= 0 and address < self._regions[index].end:
+            return self._regions[index]
+        return None
+
+    def _overlaps(self, base, size):
+        index = bisect.bisect_left(self._bases, base + size)
+        return index > 0 and self._regions[index - 1].end > base
+
+    def _pieces(self, address, size):
+        # ReadProcessMemory crosses region boundaries as long as every page on the way is committed
+        pieces = []
+        index = bisect.bisect_right(self._bases, address) - 1
+        position, remaining = address, size
+        while remaining > 0:
+            if index < 0 or index >= len(self._regions):
+                return None
+            region = self._regions[index]
+            if not region.base <= position < region.end:
+                return None
+            offset = position - region.base
+            chunk = min(remaining, len(region.data) - offset)
+            pieces.append((region, offset, chunk))
+            position += chunk
+            remaining -= chunk
+            index += 1
+        return pieces
+
+    def read(self, address, size, api="ReadProcessMemory"):
+        self._charge(api, size)
+        with self._lock:
+            pieces = self._pieces(address, size)
+            if pieces is None:
+                raise SimMemoryError(f"Could not read memory at 0x{address:X} ({size} bytes)")
+            self.bytes_read += size
+            if len(pieces) == 1:
+                region, offset, chunk = pieces[0]
+                return bytes(region.data[offset:offset + chunk])
+            return b"".join(bytes(region.data[offset:offset + chunk]) for region, offset, chunk in pieces)
+
+    def write(self, address, data, api="WriteProcessMemory"):
+        self._charge(api)
+        with self._lock:
+            pieces = self._pieces(address, len(data))
+            if pieces is None:
+                raise SimMemoryError(f"Could not write memory at 0x{address:X} ({len(data)} bytes)")
+            position = 0
+            for region, offset, chunk in pieces:
+                region.data[offset:offset + chunk] = data[position:position + chunk]
+                position += chunk
+
+    def query(self, address):
+        self._charge("VirtualQueryEx")
+        with self._lock:
+            region = self.region_at(address)
+            if region is not None:
+                return region.base, len(region.data), MEM_COMMIT, region.protect, region.type
+            index = bisect.bisect_right(self._bases, address)
+            if index >= len(self._bases):
+                if address >= USER_SPACE_END:
+                    return None
+                return address, USER_SPACE_END - address, MEM_FREE, PAGE_NOACCESS, 0
+            return address, self._bases[index] - address, MEM_FREE, PAGE_NOACCESS, 0
+
+    def allocate(self, address, size, protect):
+        self._charge("VirtualAllocEx")
+        size = (size + PAGE_SIZE - 1) & ~(PAGE_SIZE - 1)
+        with self._lock:
+            if address:
+                base = address & ~(ALLOCATION_GRANULARITY - 1)
+                if self._overlaps(base, size):
+                    return 0
+            else:
+                base = self._regions[-1].end + ALLOCATION_GRANULARITY if self._regions else MODULE_BASE
+                base = (base + ALLOCATION_GRANULARITY - 1) & ~(ALLOCATION_GRANULARITY - 1)
+            self._map(Region(base, bytearray(size), protect, MEM_PRIVATE))
+            return base
+
+    def free(self, address):
+        self._charge("VirtualFreeEx")
+        with self._lock:
+            return self._unmap(address)
+
+    def protect(self, address):
+        # Protection is reported but not enforced; section layout stays stable for region walks
+        self._charge("VirtualProtectEx")
+        region = self.region_at(address)
+        return region.protect if region else None
+
+    def exit(self):
+        self.alive.clear()
+
+
+class SnapshotData:
+    # Region contents backed by a snapshot file: reads come from its chunks, and a chunk is copied into
+    # a private bytearray the first time something writes to it, so the file itself is never modified
+    def __init__(self, snapshot, region):
+        self.snapshot = snapshot
+        self.region = region
+        self.chunk_size = snapshot.chunk_size
+        self._written = {}
+
+    def __len__(self):
+        return self.region.size
+
+    def _chunk(self, index):
+        written = self._written.get(index)
+        return written if written is not None else self.snapshot.chunk(self.region, index)
+
+    def __getitem__(self, key):
+        start, stop, _ = key.indices(self.region.size)
+        if start >= stop:
+            return b""
+        first, last = start // self.chunk_size, (stop - 1) // self.chunk_size
+        if first == last and first not in self._written:
+            return self.snapshot.read_region(self.region, start, stop)
+        parts = []
+        for index in range(first, last + 1):
+            base = index * self.chunk_size
+            parts.append(bytes(self._chunk(index)[max(start, base) - base:min(stop, base + self.chunk_size) - base]))
+        return b"".join(parts)
+
+    def __setitem__(self, key, value):
+        start, stop, _ = key.indices(self.region.size)
+        position = 0
+        while start < stop:
+            index = start // self.chunk_size
+            base = index * self.chunk_size
+            written = self._written.get(index)
+            if written is None:
+                written = self._written[index] = bytearray(self.snapshot.chunk(self.region, index))
+            end = min(stop, base + self.chunk_size)
+            written[start - base:end - base] = value[position:position + end - start]
+            position += end - start
+            start = end
+
+
+class SnapshotBackend(SimulatedProcess):
+    # Replays a capture made with snapshot.py: same region map, module base and contents as the real game
+    def __init__(self, snapshot, syscall_us=0.0, read_gbps=0.0):
+        self.image = None
+        self.snapshot = snapshot
+        self._setup(syscall_us, read_gbps)
+        self.module_base = snapshot.module_base
+        self.module_size = snapshot.module_size
+        for region in snapshot.regions:
+            region_type = region.type or (MEM_IMAGE if region.label == "module" else MEM_PRIVATE)
+            self._map(Region(region.base, SnapshotData(snapshot, region), region.protect, region_type))
+
+
+class SimPymem:
+    def __init__(self, process):
+        self.process = process
+        self.process_handle = PROCESS_HANDLE
+        self.process_id = 0x4D2
+
+    def read_bytes(self, address, length):
+        return self.process.read(address, length)
+
+    def write_bytes(self, address, value, length):
+        self.process.write(address, bytes(value[:length]))
+
+    def read_float(self, address):
+        return struct.unpack("<f", self.process.read(address, 4))[0]
+
+    def write_float(self, address, value):
+        self.process.write(address, struct.pack("<f", value))
+
+    def read_int(self, address):
+        return struct.unpack("<i", self.process.read(address, 4))[0]
+
+    def write_int(self, address, value):
+        self.process.write(address, struct.pack("<i", value))
+
+
+class _Api:
+    # ctypes function stand-in; controllers assign argtypes/restype on these
+    def __init__(self, fn):
+        self.fn = fn
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        return self.fn(*args)
+
+
+class SimKernel32:
+    def __init__(self, process):
+        self.process = process
+        self.GetExitCodeProcess = _Api(self._get_exit_code)
+        self.WaitForSingleObject = _Api(self._wait)
+        self.VirtualQueryEx = _Api(self._query)
+        self.VirtualAllocEx = _Api(self._alloc)
+        self.VirtualFreeEx = _Api(self._free)
+        self.VirtualProtectEx = _Api(self._protect)
+        self.WriteProcessMemory = _Api(self._write)
+        self.ReadProcessMemory = _Api(self._read)
+        self.CloseHandle = _Api(lambda handle: 1)
+
+    def _get_exit_code(self, handle, exit_code):
+        self.process._charge("GetExitCodeProcess")
+        _target(exit_code).value = STILL_ACTIVE if self.process.alive.is_set() else 0
+        return 1
+
+    def _wait(self, handle, milliseconds):
+        # Blocks like the real call so the exit watcher does not spin
+        exited = not self.process.alive.is_set()
+        if not exited:
+            deadline = time.monotonic() + milliseconds / 1000.0
+            while self.process.alive.is_set() and time.monotonic() < deadline:
+                time.sleep(min(0.05, milliseconds / 1000.0))
+            exited = not self.process.alive.is_set()
+        return WAIT_OBJECT_0 if exited else WAIT_TIMEOUT
+
+    def _query(self, handle, address, mbi, size):
+        info = self.process.query(_value(address))
+        if info is None:
+            return 0
+        base, region_size, state, protect, region_type = info
+        target = _target(mbi)
+        target.BaseAddress = base
+        target.AllocationBase = base
+        target.AllocationProtect = protect
+        target.RegionSize = region_size
+        target.State = state
+        target.Protect = protect
+        target.Type = region_type
+        return ctypes.sizeof(target)
+
+    def _alloc(self, handle, address, size, allocation_type, protect):
+        return self.process.allocate(_value(address), _value(size), _value(protect))
+
+    def _free(self, handle, address, size, free_type):
+        return int(self.process.free(_value(address)))
+
+    def _protect(self, handle, address, size, new_protect, old_protect):
+        previous = self.process.protect(_value(address))
+        if previous is None:
+            return 0
+        _target(old_protect).value = previous
+        return 1
+
+    def _write(self, handle, address, buffer, size, written):
+        size = _value(size)
+        data = ctypes.string_at(buffer, size) if not isinstance(buffer, (bytes, bytearray)) else bytes(buffer[:size])
+        try:
+            self.process.write(_value(address), data)
+        except SimMemoryError:
+            return 0
+        if written is not None:
+            _target(written).value = size
+        return 1
+
+    def _read(self, handle, address, buffer, size, read):
+        size = _value(size)
+        try:
+            data = self.process.read(_value(address), size)
+        except SimMemoryError:
+            return 0
+        ctypes.memmove(buffer, data, size)
+        if read is not None:
+            _target(read).value = size
+        return 1
+
+
+class SimUser32:
+    def __init__(self):
+        self.FindWindowW = _Api(lambda class_name, window_name: 0)
+        self.GetForegroundWindow = _Api(lambda: 0)
+
+
+class SimModuleInfo:
+    def __init__(self, process):
+        self.name = PROCESS_NAME
+        self.lpBaseOfDll = process.module_base
+        self.SizeOfImage = process.module_size
+
+
+@contextmanager
+def install(process):
+    # Routes the controllers' pymem and kernel32 calls to `process` for the duration of the block
+    import pymem
+    import pymem.process
+
+    kernel32 = SimKernel32(process)
+    user32 = SimUser32()
+    windll = types.SimpleNamespace(kernel32=kernel32, user32=user32)
+
+    def load_library(name, *args, **kwargs):
+        return user32 if name.lower().startswith("user32") else kernel32
+
+    def open_process(name=None, *args, **kwargs):
+        if name not in (None, PROCESS_NAME) or not process.alive.is_set():
+            raise pymem.exception.ProcessNotFound(name)
+        return SimPymem(process)
+
+    def module_from_name(handle, name):
+        return SimModuleInfo(process) if name.lower() == PROCESS_NAME.lower() else None
+
+    saved = [
+        (ctypes, "windll", getattr(ctypes, "windll", None)),
+        (ctypes, "WinDLL", getattr(ctypes, "WinDLL", None)),
+        (pymem, "Pymem", pymem.Pymem),
+        (pymem.process, "module_from_name", pymem.process.module_from_name),
+    ]
+    ctypes.windll = windll
+    ctypes.WinDLL = load_library
+    pymem.Pymem = open_process
+    pymem.process.module_from_name = module_from_name
+    try:
+        yield process
+    finally:
+        for owner, name, value in saved:
+            if value is None:
+                if hasattr(owner, name):
+                    delattr(owner, name)
+            else:
+                setattr(owner, name, value)
+
@@ -0,0 +1,209 @@
+import os
+import random
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner import load_signatures
+
+MB = 1024 * 1024
+TILE_SIZE = 4 * MB
+HEADER_SIZE = 0x1000
+IMAGE_TIMESTAMP = 0x65A0C0DE
+HEAP_BASE = 0x1F000000000
+
+# Byte runs that real x64 code is full of; they give anchors partial hits to verify instead of clean misses
+CODE_FRAGMENTS = [bytes.fromhex(h) for h in (
+    "48 83 EC 28", "48 83 C4 28 C3", "48 8B 01", "48 8B 40 08", "48 8D 54 24 30", "FF 15", "E8",
+    "F3 0F 10 40", "F3 0F 11 44 24", "F3 44 0F 11", "0F B6 00", "41 8B 03", "41 80 7B", "8B 42 08",
+    "8B 80", "80 78 04", "89 51 10", "CC CC CC CC CC CC CC CC", "00 00 00 00", "00 00 80 3F",
+)]
+
+# Value written into the leading wildcard of the heap patterns, inside / outside the controllers' float ranges
+HEAP_VALUES = {
+    "zoom.fov": (70.0, 500.0),
+    "brightness.gamma": (1.0, 100.0),
+}
+
+
+class SyntheticImage:
+    def __init__(self, data, series, planted, decoys, sections):
+        self.data = data
+        self.series = series
+        self.planted = planted
+        self.decoys = decoys
+        self.sections = sections
+
+    @property
+    def size(self):
+        return len(self.data)
+
+
+class HeapRegion:
+    __slots__ = ("base", "data")
+
+    def __init__(self, base, data):
+        self.base = base
+        self.data = data
+
+    @property
+    def size(self):
+        return len(self.data)
+
+
+class SyntheticHeap:
+    def __init__(self, regions, planted, pattern_decoys):
+        self.regions = regions
+        self.planted = planted
+        self.pattern_decoys = pattern_decoys
+
+    @property
+    def size(self):
+        return sum(region.size for region in self.regions)
+
+
+def _filler(rng, size):
+    out = bytearray()
+    while len(out) < size:
+        if rng.random() < 0.35:
+            out += rng.choice(CODE_FRAGMENTS)
+        else:
+            out += rng.randbytes(rng.randint(1, 12))
+    return out[:size]
+
+
+def _sanitize(rng, tile, signatures):
+    # The filler must not contain a real match, including across the seam when the tile is repeated
+    width = max(sig.length for sig in signatures)
+    dirty = True
+    while dirty:
+        dirty = False
+        wrapped = bytes(tile) + bytes(tile[:width])
+        for sig in signatures:
+            for start in sig.scan(wrapped, end=len(tile) + sig.length - 1):
+                offset, literal = sig.segments[0]
+                tile[(start + offset) % len(tile)] ^= 0xFF
+                dirty = True
+    return tile
+
+
+def _fill_pattern(rng, signature):
+    out = bytearray(rng.randbytes(signature.length))
+    for offset, literal in signature.segments:
+        out[offset:offset + len(literal)] = literal
+    return out
+
+
+def _near_miss(rng, signature):
+    # Matching anchor, broken elsewhere: exercises the verify step without counting as a match
+    out = _fill_pattern(rng, signature)
+    positions = [i for i, literal in enumerate(signature.mask)
+                 if literal and not signature.anchor_offset <= i < signature.anchor_offset + len(signature.anchor)]
+    if not positions:
+        positions = [signature.anchor_offset + len(signature.anchor) - 1]
+    out[rng.choice(positions)] ^= 0x5A
+    return out
+
+
+def pe_header(size_of_image, sections, timestamp=IMAGE_TIMESTAMP):
+    header = bytearray(HEADER_SIZE)
+    header[0:2] = b"MZ"
+    struct.pack_into("<I", header, 0x3C, 0x80)
+    header[0x80:0x84] = b"PE\x00\x00"
+    optional_size = 112 + 16 * 8
+    struct.pack_into("<HHIIIHH", header, 0x84, 0x8664, len(sections), timestamp, 0, 0, optional_size, 0x22)
+    optional = 0x98
+    struct.pack_into("<H", header, optional, 0x20B)
+    struct.pack_into("<I", header, optional + 56, size_of_image)
+    struct.pack_into("<I", header, optional + 60, HEADER_SIZE)
+    struct.pack_into("<I", header, optional + 108, 16)
+    table = optional + optional_size
+    for i, (name, rva, size, characteristics) in enumerate(sections):
+        struct.pack_into("<8sIIII", header, table + i * 40, name.encode("ascii"), size, rva, size, rva)
+        struct.pack_into("<I", header, table + i * 40 + 36, characteristics)
+    return header
+
+
+def build_module_image(size, seed=1, series="1.21.13", decoys=4):
+    rng = random.Random(seed)
+    signatures = {name: sig for name, sig in load_signatures(series).items() if sig.region in ("module", "code")}
+
+    size = max(size, 2 * TILE_SIZE) & ~0xFFF
+    body = size - HEADER_SIZE
+    text_size = (body * 6 // 10) & ~0xFFF
+    rdata_size = (body * 3 // 10) & ~0xFFF
+    sections = [
+        (".text", HEADER_SIZE, text_size, 0x60000020),
+        (".rdata", HEADER_SIZE + text_size, rdata_size, 0x40000040),
+        (".data", HEADER_SIZE + text_size + rdata_size, body - text_size - rdata_size, 0xC0000040),
+    ]
+
+    tile = _sanitize(rng, _filler(rng, TILE_SIZE), list(signatures.values()))
+    data = bytearray(size)
+    for pos in range(HEADER_SIZE, size, TILE_SIZE):
+        chunk = min(TILE_SIZE, size - pos)
+        data[pos:pos + chunk] = tile[:chunk]
+    data[:HEADER_SIZE] = pe_header(size, sections)
+
+    # One slot per planted site, spread over the section each signature really lives in
+    planted, near_misses = {}, {}
+    text_slots = rng.sample(range(16, text_size // 0x100 - 16), len(signatures) * (decoys + 1))
+    rdata_slots = rng.sample(range(16, rdata_size // 0x100 - 16), len(signatures) * (decoys + 1))
+    for name, sig in sorted(signatures.items()):
+        in_rdata = name == "reach.value"
+        base, slots = (sections[1][1], rdata_slots) if in_rdata else (sections[0][1], text_slots)
+        offset = base + slots.pop() * 0x100 + rng.randrange(0, 0x80)
+        data[offset:offset + sig.length] = _fill_pattern(rng, sig)
+        planted[name] = offset
+        near_misses[name] = []
+        for _ in range(decoys):
+            decoy = base + slots.pop() * 0x100 + rng.randrange(0, 0x80)
+            data[decoy:decoy + sig.length] = _near_miss(rng, sig)
+            near_misses[name].append(decoy)
+    return SyntheticImage(data, series, planted, near_misses, sections)
+
+
+def build_heap_regions(total_size, seed=1, series="1.21.13", min_region=64 * 1024, max_region=16 * MB, decoys=8):
+    rng = random.Random(seed)
+    signatures = {name: sig for name, sig in load_signatures(series).items() if sig.region == "heap"}
+
+    # Heap memory is mostly zeroed pages and pointer-sized noise; a shared tile keeps generation cheap
+    tile = bytearray(TILE_SIZE)
+    for pos in range(0, TILE_SIZE, 0x40):
+        if rng.random() < 0.4:
+            tile[pos:pos + 0x20] = rng.randbytes(0x20)
+    tile = _sanitize(rng, tile, list(signatures.values()))
+
+    regions = []
+    base = HEAP_BASE
+    remaining = total_size
+    while remaining > 0:
+        region_size = min(remaining, rng.randrange(min_region, max_region + 1, 0x1000))
+        data = bytearray(region_size)
+        start = rng.randrange(0, TILE_SIZE - 0x1000, 0x1000)
+        for pos in range(0, region_size, TILE_SIZE - start):
+            chunk = min(TILE_SIZE - start, region_size - pos)
+            data[pos:pos + chunk] = tile[start:start + chunk]
+        regions.append(HeapRegion(base, data))
+        base += region_size + 0x10000
+        remaining -= region_size
+
+    # Real values late in the address space (worst case for a front-to-back walk); out-of-range decoys before them
+    planted, pattern_decoys = {}, {}
+    for name, sig in sorted(signatures.items()):
+        good, bad = HEAP_VALUES.get(name, (1.0, 1e9))
+        pattern_decoys[name] = []
+        picks = sorted(rng.sample(range(len(regions)), min(len(regions), decoys + 1)))
+        for index, region_index in enumerate(picks):
+            region = regions[region_index]
+            is_real = index == len(picks) - 1
+            offset = rng.randrange(0, max(1, region.size - sig.length - 0x100), 4)
+            site = _fill_pattern(rng, sig)
+            site[0:4] = struct.pack("<f", good if is_real else bad)
+            region.data[offset:offset + sig.length] = site
+            if is_real:
+                planted[name] = region.base + offset
+            else:
+                pattern_decoys[name].append(region.base + offset)
+    return SyntheticHeap(regions, planted, pattern_decoys)
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+from scanner import COMMON_SERIES, SIGNATURE_DB, compile_signature, database_digest, merged_entries
+import json
+
+OUTPUT_FILE = "signature_tables.py"
+
+
+def format_row(signature):
+    return (
+        f"({signature.region!r}, {signature.offset}, {signature.length}, {signature.pattern!r}, {signature.mask!r}, "
+        f"{signature.anchor!r}, {signature.anchor_offset}, {signature.segments!r}, {signature.skip!r})"
+    )
+
+
+def build(project_root=None):
+    project_root = Path(project_root or Path(__file__).parent)
+    raw = (project_root / SIGNATURE_DB).read_bytes()
+    db = json.loads(raw.decode("utf-8"))
+
+    series_names = [COMMON_SERIES] + sorted(db.get("series", {}))
+    lines = [
+        f"# Generated by build_signatures.py from {SIGNATURE_DB}; do not edit.",
+        f"FORMAT = {db.get('format', 1)}",
+        f"REVISION = {db.get('revision', 0)}",
+        f"SOURCE_SHA1 = {database_digest(raw)!r}",
+        "",
+        "# name: (region, offset, length, pattern, mask, anchor, anchor_offset, segments, skip)",
+        "TABLES = {",
+    ]
+    count = 0
+    for series in series_names:
+        lines.append(f"    {series!r}: {{")
+        for name, entry in sorted(merged_entries(db, series).items()):
+            signature = compile_signature(name, entry)
+            lines.append(f"        {name!r}: {format_row(signature)},")
+            count += 1
+        lines.append("    },")
+    lines.append("}")
+
+    output = project_root / OUTPUT_FILE
+    output.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"Wrote {count} signature tables for {len(series_names)} series to {output.name}")
+    return output
+
+
+if __name__ == "__main__":
+    try:
+        build(sys.argv[1] if len(sys.argv) > 1 else None)
+    except (OSError, ValueError) as e:
+        print(f"Signature build failed: {e}")
+        sys.exit(1)
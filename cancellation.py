@@ -0,0 +1,25 @@
+import threading
+
+
+class OperationCancelled(Exception):
+    pass
+
+
+class CancellationToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def wait(self, timeout):
+        # Interruptible replacement for time.sleep(); returns True once cancelled
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled()
@@ -1,97 +1,210 @@
-import json
-import os
-from typing import Any
-
-class ConfigManager:
-    DEFAULT_CONFIG = {
-        "keybinds": {
-            "brightness": "g",
-            "zoom": "c",
-            "sprint": "p",
-            "autoclicker_left": "z",
-            "autoclicker_right": "x"
-        },
-        "feature_states": {
-            "brightness": False,
-            "zoom": False,
-            "sprint": False,
-            "coordinates": False,
-            "speed": False,
-            "reach": False,
-            "autoclicker": False,
-            "antiknockback": False,
-            "hitbox": False,
-            "streamprotect": False,
-            "nohurtcam": False,
-            "truesight": False,
-            "timechanger": False,
-            "fastitem": False,
-            "systemtray": False
-        },
-        "feature_settings": {
-            "speed": {"speed": 0.5},
-            "reach": {"reach": 3.0},
-            "autoclicker": {
-                "left_cps": 10.0,
-                "right_cps": 10.0,
-                "left_enabled": True,
-                "right_enabled": True
-            },
-            "hitbox": {"hitbox": 1.0},
-            "antiknockback": {
-                "xz": 0.8,
-                "y": 0.8
-            }
-        }
-    }
-
-    def __init__(self, config_path: str = "config.json"):
-        self.config_path = config_path
-        self.config = self._load_or_create()
-
-    def _load_or_create(self) -> dict:
-        if os.path.exists(self.config_path):
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                loaded = json.load(f)
-                return self._deep_merge(self.DEFAULT_CONFIG.copy(), loaded)
-        else:
-            self._save(self.DEFAULT_CONFIG)
-            return self.DEFAULT_CONFIG.copy()
-
-    def _deep_merge(self, default: dict, override: dict) -> dict:
-        for key, value in override.items():
-            if isinstance(value, dict) and key in default and isinstance(default[key], dict):
-                default[key] = self._deep_merge(default[key], value)
-            else:
-                default[key] = value
-        return default
-
-    def _save(self, data: dict):
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-
-    def get_keybind(self, feature: str) -> str | None:
-        return self.config["keybinds"].get(feature)
-
-    def set_keybind(self, feature: str, key: str):
-        self.config["keybinds"][feature] = key
-        self._save(self.config)
-
-    def get_state(self, feature: str, default: bool = False) -> bool:
-        return self.config["feature_states"].get(feature, default)
-
-    def set_state(self, feature: str, state: bool):
-        self.config["feature_states"][feature] = state
-        self._save(self.config)
-
-    def get_setting(self, feature: str, key: str, default: Any = None) -> Any:
-        return self.config["feature_settings"].get(feature, {}).get(key, default)
-
-    def set_setting(self, feature: str, key: str, value: Any):
-        if feature not in self.config["feature_settings"]:
-            self.config["feature_settings"][feature] = {}
-        self.config["feature_settings"][feature][key] = value
-        self._save(self.config)
-
-    def save(self):
+import json
+import os
+import threading
+import time
+from typing import Any
+
+class ConfigManager:
+    DEFAULT_CONFIG = {
+        "keybinds": {
+            "brightness": "g",
+            "zoom": "c",
+            "sprint": "p",
+            "autoclicker_left": "z",
+            "autoclicker_right": "x"
+        },
+        "feature_states": {
+            "brightness": False,
+            "zoom": False,
+            "sprint": False,
+            "coordinates": False,
+            "speed": False,
+            "reach": False,
+            "autoclicker": False,
+            "antiknockback": False,
+            "hitbox": False,
+            "streamprotect": False,
+            "nohurtcam": False,
+            "truesight": False,
+            "timechanger": False,
+            "fastitem": False,
+            "systemtray": False
+        },
+        "feature_settings": {
+            "speed": {"speed": 0.5},
+            "reach": {"reach": 3.0},
+            "autoclicker": {
+                "left_cps": 10.0,
+                "right_cps": 10.0,
+                "left_enabled": True,
+                "right_enabled": True
+            },
+            "hitbox": {"hitbox": 1.0},
+            "antiknockback": {
+                "xz": 0.8,
+                "y": 0.8
+            }
+        }
+    }
+
+    _shared_instance = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, config_path: str = "config.json") -> "ConfigManager":
+        # One store per process so every controller sees GUI edits immediately
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls(config_path, write_behind=True)
+            return cls._shared_instance
+
+    def __init__(self, config_path: str = "config.json", write_behind: bool = False, flush_interval_ms: int = 500):
+        self.config_path = config_path
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._dirty = False
+        self._dirty_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._last_flush = 0.0
+        self._flusher_thread = None
+        self._listeners = {}
+        self.config = self._load_or_create()
+
+    def _load_or_create(self) -> dict:
+        if os.path.exists(self.config_path):
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+                return self._deep_merge(self.DEFAULT_CONFIG.copy(), loaded)
+        else:
+            self._save(self.DEFAULT_CONFIG)
+            return self.DEFAULT_CONFIG.copy()
+
+    def _deep_merge(self, default: dict, override: dict) -> dict:
+        for key, value in override.items():
+            if isinstance(value, dict) and key in default and isinstance(default[key], dict):
+                default[key] = self._deep_merge(default[key], value)
+            else:
+                default[key] = value
+        return default
+
+    def _save(self, data: dict):
+        with self._lock:
+            text = json.dumps(data, indent=4, ensure_ascii=False)
+        # Write to a sibling temp file and swap it in so a crash never leaves a truncated config
+        tmp_path = self.config_path + ".tmp"
+        with self._io_lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_path)
+            self._last_flush = time.monotonic()
+
+    def _mark_dirty(self):
+        if not self.write_behind:
+            self._save(self.config)
+            return
+        with self._lock:
+            self._dirty = True
+            if self._flusher_thread is None or not self._flusher_thread.is_alive():
+                self._stop_event.clear()
+                self._flusher_thread = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flusher_thread.start()
+        self._dirty_event.set()
+
+    def _flush_loop(self):
+        while not self._stop_event.is_set():
+            self._dirty_event.wait()
+            if self._stop_event.is_set():
+                break
+            delay = self._last_flush + self.flush_interval - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                break
+            self._dirty_event.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Config flush failed: {e}")
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+        self._save(self.config)
+
+    def close(self):
+        self._stop_event.set()
+        self._dirty_event.set()
+        if self._flusher_thread and self._flusher_thread is not threading.current_thread():
+            self._flusher_thread.join(timeout=2)
+        self._flusher_thread = None
+        self.flush()
+
+    def on_change(self, path: str, callback):
+        # path is "section" or "section.feature" or "feature_settings.feature.key";
+        # callback(path, value) runs on the thread that made the change
+        if path.split(".")[0] not in self.DEFAULT_CONFIG:
+            raise ValueError(f"Unknown config section: {path}")
+        with self._lock:
+            self._listeners.setdefault(path, []).append(callback)
+
+    def remove_listener(self, path: str, callback):
+        with self._lock:
+            callbacks = self._listeners.get(path)
+            if callbacks and callback in callbacks:
+                callbacks.remove(callback)
+
+    def _notify(self, path: str, value: Any):
+        parts = path.split(".")
+        with self._lock:
+            callbacks = []
+            for i in range(len(parts), 0, -1):
+                callbacks.extend(self._listeners.get(".".join(parts[:i]), ()))
+        for callback in callbacks:
+            try:
+                callback(path, value)
+            except Exception as e:
+                print(f"Config listener for {path} failed: {e}")
+
+    def get_keybind(self, feature: str) -> str | None:
+        return self.config["keybinds"].get(feature)
+
+    def set_keybind(self, feature: str, key: str):
+        with self._lock:
+            changed = self.config["keybinds"].get(feature) != key
+            self.config["keybinds"][feature] = key
+        self._mark_dirty()
+        if changed:
+            self._notify(f"keybinds.{feature}", key)
+
+    def get_state(self, feature: str, default: bool = False) -> bool:
+        return self.config["feature_states"].get(feature, default)
+
+    def set_state(self, feature: str, state: bool):
+        with self._lock:
+            changed = self.config["feature_states"].get(feature) != state
+            self.config["feature_states"][feature] = state
+        self._mark_dirty()
+        if changed:
+            self._notify(f"feature_states.{feature}", state)
+
+    def get_setting(self, feature: str, key: str, default: Any = None) -> Any:
+        return self.config["feature_settings"].get(feature, {}).get(key, default)
+
+    def set_setting(self, feature: str, key: str, value: Any):
+        with self._lock:
+            if feature not in self.config["feature_settings"]:
+                self.config["feature_settings"][feature] = {}
+            changed = self.config["feature_settings"][feature].get(key) != value
+            self.config["feature_settings"][feature][key] = value
+        self._mark_dirty()
+        if changed:
+            self._notify(f"feature_settings.{feature}.{key}", value)
+
+    def save(self):
+        with self._lock:
+            self._dirty = False
         self._save(self.config)
\ No newline at end of file
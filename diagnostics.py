@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+import psutil
+import metrics
+
+SAMPLE_INTERVAL = 1.0
+SCAN_METRICS = ("scan.heap_duration", "scan.duration")
+SYSCALL_METRICS = ("mem.read", "mem.write", "mem.protect", "mem.alloc", "mem.query")
+
+
+class DiagnosticsSampler:
+    # Samples the metrics registry at a fixed rate and posts one coalesced ('diagnostics', rows) event per tick
+    def __init__(self, update_queue, controllers, attach_times, interval=SAMPLE_INTERVAL):
+        self.update_queue = update_queue
+        self.controllers = controllers
+        self.attach_times = attach_times
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = psutil.Process(os.getpid())
+        self._previous = {}
+        self._previous_time = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._previous = {}
+        self._previous_time = None
+        self._process.cpu_percent(None)
+        self._thread = threading.Thread(target=self._run, name="diagnostics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.update_queue.put(('diagnostics', self.sample()))
+            except Exception as e:
+                print(f"Diagnostics sample failed: {e}")
+            self._stop.wait(self.interval)
+
+    def _totals(self, label):
+        owned = metrics.registry.metrics_for(label)
+        syscalls = sum(owned[name].value for name in SYSCALL_METRICS if name in owned)
+        cpu = sum(metric.value for name, metric in owned.items() if name.startswith("loop.") and name.endswith(".cpu_s"))
+        return syscalls, cpu
+
+    def _last_scan(self, label):
+        for name in SCAN_METRICS:
+            histogram = metrics.registry.find(name, label)
+            if histogram is not None and histogram.last is not None:
+                return histogram.last / 1e6
+        return None
+
+    def sample(self):
+        now = time.perf_counter()
+        elapsed = now - self._previous_time if self._previous_time is not None else None
+        rows = {}
+        for label, controller in self.controllers.items():
+            syscalls, cpu = self._totals(label)
+            previous = self._previous.get(label)
+            threads = sum(1 for value in vars(controller).values()
+                          if isinstance(value, threading.Thread) and value.is_alive())
+            rows[label] = {
+                "attach_s": self.attach_times.get(label),
+                "scan_s": self._last_scan(label),
+                "syscalls_per_s": (syscalls - previous[0]) / elapsed if previous and elapsed else None,
+                "threads": threads,
+                "loop_cpu": (cpu - previous[1]) / elapsed if previous and elapsed else None,
+            }
+            self._previous[label] = (syscalls, cpu)
+        self._previous_time = now
+
+        with self._process.oneshot():
+            process = {
+                "rss": self._process.memory_info().rss,
+                "threads": self._process.num_threads(),
+                "cpu_percent": self._process.cpu_percent(None),
+            }
+        return {"enabled": metrics.registry.enabled, "controllers": rows, "process": process}
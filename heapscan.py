@@ -0,0 +1,179 @@
+import ctypes
+
+PAGE_READWRITE = 0x04
+PAGE_WRITECOPY = 0x08
+USER_SPACE_END = 0x7FFFFFFFFFFFFFFF
+NEIGHBOURHOOD = 64 * 1024 * 1024
+WINDOW_SIZE = 4 * 1024 * 1024
+MAX_OVERLAP = 4096
+
+
+class MEMORY_BASIC_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ("BaseAddress", ctypes.c_void_p),
+        ("AllocationBase", ctypes.c_void_p),
+        ("AllocationProtect", ctypes.c_ulong),
+        ("PartitionKey", ctypes.c_ushort),
+        ("RegionSize", ctypes.c_size_t),
+        ("State", ctypes.c_ulong),
+        ("Protect", ctypes.c_ulong),
+        ("Type", ctypes.c_ulong),
+    ]
+
+
+class HeapRegion:
+    __slots__ = ("base", "size", "allocation_base")
+
+    def __init__(self, base, size, allocation_base):
+        self.base = base
+        self.size = size
+        self.allocation_base = allocation_base
+
+    @property
+    def end(self):
+        return self.base + self.size
+
+    @property
+    def identity(self):
+        return self.size, self.allocation_base
+
+    def distance(self, address):
+        if address < self.base:
+            return self.base - address
+        if address >= self.end:
+            return address - self.end + 1
+        return 0
+
+    def __repr__(self):
+        return f"HeapRegion(0x{self.base:X}, size=0x{self.size:X})"
+
+
+def walk_regions(query, handle, protect=PAGE_READWRITE):
+    # Only the region table is walked here; no memory is read. `protect` may be a tuple of values
+    allowed = (protect,) if isinstance(protect, int) else tuple(protect)
+    mbi = MEMORY_BASIC_INFORMATION()
+    address = 0
+    regions = []
+    while query(handle, ctypes.c_void_p(address), ctypes.byref(mbi), ctypes.sizeof(mbi)):
+        if mbi.Protect in allowed:
+            regions.append(HeapRegion(mbi.BaseAddress, mbi.RegionSize, mbi.AllocationBase or mbi.BaseAddress))
+        address += mbi.RegionSize
+        if address >= USER_SPACE_END:
+            break
+    return regions
+
+
+class RegionReader:
+    # One buffer per controller, allocated once: each region is read window by window into it with
+    # ReadProcessMemory, and the last length-1 bytes of a window are moved to the front before the next
+    # read so a match straddling the seam is still found (and found only once)
+    def __init__(self, read, window=WINDOW_SIZE, overlap=MAX_OVERLAP):
+        self.read = read
+        self.window = window
+        self.overlap = overlap
+        self.buffer = bytearray(window + overlap)
+        self.view = memoryview(self.buffer)
+        self._target = (ctypes.c_char * len(self.buffer)).from_buffer(self.buffer)
+        self._address = ctypes.addressof(self._target)
+        self._count = ctypes.c_size_t()
+        self.regions_scanned = 0
+        self.bytes_scanned = 0
+
+    def _read_into(self, handle, address, offset, length):
+        self._count.value = 0
+        ok = self.read(handle, ctypes.c_void_p(address), ctypes.c_void_p(self._address + offset),
+                       ctypes.c_size_t(length), ctypes.byref(self._count))
+        if not ok or self._count.value != length:
+            raise OSError(f"ReadProcessMemory failed at 0x{address:X} ({length} bytes)")
+
+    def matches(self, handle, region, signature):
+        # Yields (address, offset): the match starts at self.buffer[offset], valid until the next item
+        carry = min(signature.length - 1, self.overlap)
+        kept = 0
+        position = region.base
+        end = region.end
+        while position < end:
+            length = min(self.window, end - position)
+            self._read_into(handle, position, kept, length)
+            filled = kept + length
+            start = position - kept
+            for offset in signature.iter_matches(self.buffer, 0, filled):
+                yield start + offset, offset
+            position += length
+            kept = min(carry, filled)
+            self.view[:kept] = self.view[filled - kept:filled]
+
+
+    def scan(self, handle, regions, signature, cancel_token=None):
+        # Lazily chains matches() over `regions`; a region that cannot be read is skipped
+        self.regions_scanned = 0
+        self.bytes_scanned = 0
+        for region in regions:
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+            self.regions_scanned += 1
+            self.bytes_scanned += region.size
+            try:
+                yield from self.matches(handle, region, signature)
+            except OSError:
+                continue
+
+
+class HeapScanState:
+    # Remembers the region layout of the previous walk and where the value was found, so a rescan
+    # can start next to the old hit and then look only at regions that appeared or changed size.
+    def __init__(self, neighbourhood=NEIGHBOURHOOD):
+        self.neighbourhood = neighbourhood
+        self.known = {}
+        self.hits = []
+        self.hit_allocations = set()
+        self.full_count = 0
+
+    @property
+    def primed(self):
+        return bool(self.known)
+
+    def reset(self):
+        self.known = {}
+        self.hits = []
+        self.hit_allocations = set()
+        self.full_count = 0
+
+    def _proximity(self, region):
+        if region.allocation_base in self.hit_allocations:
+            return 0
+        best = None
+        for hit in self.hits:
+            distance = region.distance(hit)
+            if best is None or distance < best:
+                best = distance
+        if best is not None and best <= self.neighbourhood:
+            return best
+        return None
+
+    def plan(self, regions):
+        # Returns (priority, rest): neighbours of the last hit nearest first, then new or resized
+        # regions, and everything unchanged since the last walk in `rest`
+        near, changed, rest = [], [], []
+        for region in regions:
+            proximity = self._proximity(region)
+            if proximity is not None:
+                near.append((proximity, region))
+            elif self.known.get(region.base) != region.identity:
+                changed.append(region)
+            else:
+                rest.append(region)
+        near.sort(key=lambda item: item[0])
+        return [region for _, region in near] + changed, rest
+
+    def commit(self, regions, hits=None, full=False):
+        # full: every region was scanned, so len(hits) is how many copies an incremental pass must find
+        self.known = {region.base: region.identity for region in regions}
+        if full:
+            self.full_count = len(hits or ())
+        if hits:
+            self.hits = list(hits)
+            self.hit_allocations = {
+                region.allocation_base for region in regions
+                if any(region.base <= hit < region.end for hit in self.hits)
+            }
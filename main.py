@@ -1,8 +1,24 @@
-import sys
-import os
-import ctypes
-from gui import MinecraftModApp
-
-if __name__ == "__main__":
-    app = MinecraftModApp()
-    app.mainloop()
\ No newline at end of file
+import sys
+import os
+import ctypes
+import metrics
+import tracing
+from profiler import profiler, parse_hz
+from gui import MinecraftModApp
+
+if __name__ == "__main__":
+    if "--metrics" in sys.argv[1:]:
+        metrics.registry.enable()
+    if "--trace" in sys.argv[1:]:
+        tracing.tracer.enable()
+    profile_hz = parse_hz(sys.argv[1:])
+    if profile_hz:
+        profiler.start(profile_hz)
+    app = MinecraftModApp()
+    app.mainloop()
+    if metrics.registry.enabled:
+        metrics.registry.dump_json(metrics.METRICS_FILE)
+    if tracing.tracer.enabled:
+        tracing.tracer.dump(tracing.TRACE_FILE)
+    if profiler.stop():
+        profiler.dump()
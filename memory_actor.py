@@ -0,0 +1,199 @@
+import collections
+import threading
+import time
+import metrics
+from animation import FrameAnimator
+
+
+class FloatSnapshot:
+    # Immutable; readers grab the whole object in one attribute load and never see a torn update
+    __slots__ = ("value", "version", "error", "at")
+
+    def __init__(self, value, version, error=None):
+        self.value = value
+        self.version = version
+        self.error = error
+        self.at = time.perf_counter()
+
+
+EMPTY_SNAPSHOT = FloatSnapshot(None, 0)
+
+
+class MemoryCommand:
+    __slots__ = ("kind", "args", "result", "superseded", "_done")
+
+    def __init__(self, kind, *args):
+        self.kind = kind
+        self.args = args
+        self.result = None
+        self.superseded = False
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def finish(self, result=None, superseded=False):
+        self.result = result
+        self.superseded = superseded
+        self._done.set()
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.result
+
+
+class FloatMemoryActor:
+    # Sole owner of one float in the game process. Any thread submits set/animate/restore commands
+    # with an atomic deque append; the actor runs only the newest one and marks the rest superseded.
+    # A newer command also cuts a running animation short, so input never waits behind a transition.
+    def __init__(self, name, animator=None, poll_interval=0.01, on_error=None):
+        self.name = name
+        self.animator = animator or FrameAnimator()
+        self.poll_interval = poll_interval
+        self.on_error = on_error
+        self.snapshot = EMPTY_SNAPSHOT
+        self.pm = None
+        self.address = None
+        self._commands = collections.deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._version = 0
+
+    @property
+    def value(self):
+        return self.snapshot.value
+
+    @property
+    def healthy(self):
+        snapshot = self.snapshot
+        return self.address is not None and snapshot.error is None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def attach(self, pm, address):
+        self.pm = pm
+        self.address = address
+        self.snapshot = EMPTY_SNAPSHOT
+
+    def detach(self):
+        self.address = None
+        self.snapshot = EMPTY_SNAPSHOT
+
+    def start(self):
+        if self.running:
+            return
+        # Whatever was submitted while stopped is stale by now
+        self._drain(superseded=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-memory", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self._drain(superseded=True)
+
+    def submit(self, command):
+        metrics.registry.counter("actor.commands", self.name).inc()
+        self._commands.append(command)
+        self._wake.set()
+        return command
+
+    def set(self, value):
+        return self.submit(MemoryCommand("set", value))
+
+    def restore(self, value):
+        return self.submit(MemoryCommand("restore", value))
+
+    def animate(self, start_value, end_value, duration, easing, keep_going=None):
+        return self.submit(MemoryCommand("animate", start_value, end_value, duration, easing, keep_going))
+
+    def _drain(self, superseded=False):
+        latest = None
+        while True:
+            try:
+                command = self._commands.popleft()
+            except IndexError:
+                break
+            if latest is not None:
+                latest.finish(superseded=True)
+                metrics.registry.counter("actor.superseded", self.name).inc()
+            latest = command
+        if latest is not None and superseded:
+            latest.finish(superseded=True)
+            return None
+        return latest
+
+    def _publish(self, value, error=None):
+        self._version += 1
+        self.snapshot = FloatSnapshot(value, self._version, error)
+
+    def _write(self, value):
+        self.pm.write_float(self.address, value)
+        self._publish(value)
+
+    def _poll(self):
+        if self.address is None or self.pm is None:
+            return
+        try:
+            value = self.pm.read_float(self.address)
+        except Exception as e:
+            self._fail(e)
+            return
+        if self.snapshot.value != value or self.snapshot.error is not None:
+            self._publish(value)
+
+    def _fail(self, error):
+        # Only the healthy -> failed transition is reported; a dead address would otherwise fire every poll
+        if self.snapshot.error is not None:
+            return
+        self._publish(self.snapshot.value, error)
+        if self.on_error:
+            self.on_error(error)
+
+    def _execute(self, command):
+        if self.address is None or self.pm is None:
+            command.finish()
+            return
+        try:
+            if command.kind in ("set", "restore"):
+                self._write(command.args[0])
+                command.finish(True)
+            elif command.kind == "animate":
+                start_value, end_value, duration, easing, keep_going = command.args
+                if start_value is None:
+                    start_value = self.snapshot.value
+                    if start_value is None:
+                        start_value = self.pm.read_float(self.address)
+                interrupted = []
+
+                def still_wanted():
+                    # A queued command means the caller changed its mind; stop here and run that instead
+                    if self._commands or self._stop.is_set():
+                        interrupted.append(True)
+                        return False
+                    return keep_going is None or keep_going()
+
+                result = self.animator.run(start_value, end_value, duration, easing, self._write, still_wanted)
+                command.finish(result, superseded=bool(interrupted))
+        except Exception as e:
+            command.finish()
+            self._fail(e)
+
+    def _run(self):
+        while not self._stop.is_set():
+            command = self._drain()
+            if command is not None:
+                self._execute(command)
+                continue
+            if self._wake.wait(self.poll_interval):
+                self._wake.clear()
+                continue
+            self._poll()
@@ -0,0 +1,336 @@
+import json
+import os
+import threading
+import time
+
+METRICS_FILE = "metrics.json"
+GLOBAL = "client"
+
+# 16 linear sub-buckets per power of two above 32: a bucket is at most 1/16 of its lower bound wide, so
+# recorded values are kept within ~6.25% (HDR-style log-linear layout)
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+
+def _bucket_index(value):
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift * SUB_BUCKET_HALF) + (value >> shift)
+
+
+def _bucket_range(index):
+    if index < SUB_BUCKET_COUNT:
+        return index, index
+    shift = index // SUB_BUCKET_HALF - 1
+    mantissa = index - shift * SUB_BUCKET_HALF
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Counter:
+    __slots__ = ("value",)
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def snapshot(self):
+        return {"type": self.kind, "value": self.value}
+
+
+class Gauge:
+    __slots__ = ("value",)
+    kind = "gauge"
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        return {"type": self.kind, "value": self.value}
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, unit="us"):
+        self.unit = unit
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.last = None
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = _bucket_index(value)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            self.last = value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def percentile(self, percent):
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, int(round(self.count * percent / 100.0)))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= target:
+                    # Highest value equivalent to the bucket, capped by the real maximum
+                    return min(_bucket_range(index)[1], self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "type": self.kind,
+            "unit": self.unit,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "last": self.last,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+
+class _NullMetric:
+    # Handed out while disabled so call sites never branch
+    __slots__ = ()
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def record(self, value):
+        pass
+
+
+NULL_METRIC = _NullMetric()
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record((time.perf_counter() - self.start) * 1e6)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.time()
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._metrics = {}
+            self.started = time.time()
+
+    def _get(self, cls, name, controller, *args):
+        key = (controller or GLOBAL, name)
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = cls(*args)
+        return metric
+
+    def counter(self, name, controller=None):
+        if not self.enabled:
+            return NULL_METRIC
+        return self._get(Counter, name, controller)
+
+    def gauge(self, name, controller=None):
+        if not self.enabled:
+            return NULL_METRIC
+        return self._get(Gauge, name, controller)
+
+    def histogram(self, name, controller=None, unit="us"):
+        if not self.enabled:
+            return NULL_METRIC
+        return self._get(Histogram, name, controller, unit)
+
+    def timer(self, name, controller=None):
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self._get(Histogram, name, controller, "us"))
+
+    def value(self, name, controller=None, default=None):
+        metric = self._metrics.get((controller or GLOBAL, name))
+        if metric is None or isinstance(metric, Histogram):
+            return default
+        return metric.value
+
+    def find(self, name, controller=None):
+        return self._metrics.get((controller or GLOBAL, name))
+
+    def metrics_for(self, controller=None):
+        owner = controller or GLOBAL
+        with self._lock:
+            return {name: metric for (key, name), metric in self._metrics.items() if key == owner}
+
+    def snapshot(self):
+        with self._lock:
+            items = list(self._metrics.items())
+        controllers = {}
+        for (controller, name), metric in sorted(items):
+            controllers.setdefault(controller, {})[name] = metric.snapshot()
+        return {
+            "enabled": self.enabled,
+            "started": self.started,
+            "uptime_s": time.time() - self.started,
+            "controllers": controllers,
+        }
+
+    def dump_json(self, path=None):
+        text = json.dumps(self.snapshot(), indent=2)
+        if path:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return text
+
+
+registry = MetricsRegistry(enabled=os.environ.get("TORIO_METRICS") == "1")
+
+
+def counted(name, controller, fn):
+    # Wraps a Win32 call so each invocation bumps a per-controller counter while metrics are on
+    def call(*args):
+        if registry.enabled:
+            registry.counter(name, controller).inc()
+        return fn(*args)
+    call.__wrapped__ = fn
+    return call
+
+
+class ProcessMetrics:
+    # Proxy over a pymem.Pymem that counts reads/writes per controller; everything else passes through
+    def __init__(self, pm, controller):
+        self._pm = pm
+        self._controller = controller
+
+    def __getattr__(self, name):
+        return getattr(self._pm, name)
+
+    @property
+    def target(self):
+        return self._pm
+
+    def _read(self, size):
+        if registry.enabled:
+            registry.counter("mem.read", self._controller).inc()
+            registry.counter("mem.read_bytes", self._controller).inc(size)
+
+    def _write(self, size):
+        if registry.enabled:
+            registry.counter("mem.write", self._controller).inc()
+            registry.counter("mem.write_bytes", self._controller).inc(size)
+
+    def read_bytes(self, address, length):
+        self._read(length)
+        return self._pm.read_bytes(address, length)
+
+    def read_float(self, address):
+        self._read(4)
+        return self._pm.read_float(address)
+
+    def read_int(self, address):
+        self._read(4)
+        return self._pm.read_int(address)
+
+    def write_bytes(self, address, value, length):
+        self._write(length)
+        return self._pm.write_bytes(address, value, length)
+
+    def write_float(self, address, value):
+        self._write(4)
+        return self._pm.write_float(address, value)
+
+    def write_int(self, address, value):
+        self._write(4)
+        return self._pm.write_int(address, value)
+
+
+def instrument_process(pm, controller):
+    if pm is None or isinstance(pm, ProcessMetrics):
+        return pm
+    return ProcessMetrics(pm, controller)
+
+
+class LoopMeter:
+    # One per polling loop: iteration count, lateness against the intended period and thread CPU time
+    def __init__(self, controller, loop, period=None):
+        self.controller = controller
+        self.prefix = f"loop.{loop}"
+        self.period = period
+        self._last = None
+        self._cpu_start = None
+
+    def tick(self):
+        if not registry.enabled:
+            self._last = None
+            return
+        now = time.perf_counter()
+        cpu = time.thread_time()
+        registry.counter(f"{self.prefix}.iterations", self.controller).inc()
+        if self._last is not None:
+            interval = now - self._last
+            if self.period is not None:
+                registry.histogram(f"{self.prefix}.lateness", self.controller).record((interval - self.period) * 1e6)
+            else:
+                registry.histogram(f"{self.prefix}.interval", self.controller).record(interval * 1e6)
+        if self._cpu_start is None:
+            self._cpu_start = cpu
+        registry.gauge(f"{self.prefix}.cpu_s", self.controller).set(cpu - self._cpu_start)
+        self._last = now
@@ -1,15 +1,15 @@
-__all__ = [
-    'antiknockback',
-    'reach',
-    'hitbox',
-    'zoom',
-    'brightness',
-    'speed',
-    'coordinates',
-    'autoclicker',
-    'sprint',
-    'streamprotect',
-]
-
-__version__ = '1.0.0'
-__author__ = 'GhostClient'
+__all__ = [
+    'antiknockback',
+    'reach',
+    'hitbox',
+    'zoom',
+    'brightness',
+    'speed',
+    'coordinates',
+    'autoclicker',
+    'sprint',
+    'streamprotect',
+]
+
+__version__ = '1.0.0'
+__author__ = 'GhostClient'
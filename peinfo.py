@@ -0,0 +1,238 @@
+import struct
+
+IMAGE_DOS_SIGNATURE = b'MZ'
+IMAGE_NT_SIGNATURE = b'PE\x00\x00'
+IMAGE_NT_OPTIONAL_HDR32_MAGIC = 0x10B
+IMAGE_NT_OPTIONAL_HDR64_MAGIC = 0x20B
+IMAGE_DIRECTORY_ENTRY_RESOURCE = 2
+IMAGE_SCN_CNT_CODE = 0x00000020
+IMAGE_SCN_MEM_EXECUTE = 0x20000000
+RT_VERSION = 16
+VS_FFI_SIGNATURE = 0xFEEF04BD
+RESOURCE_DEPTH = 3
+
+HEADER_READ_SIZE = 0x1000
+
+
+class PEFormatError(ValueError):
+    pass
+
+
+class Section:
+    def __init__(self, name, virtual_address, virtual_size, raw_offset, raw_size, characteristics):
+        self.name = name
+        self.virtual_address = virtual_address
+        self.virtual_size = virtual_size
+        self.raw_offset = raw_offset
+        self.raw_size = raw_size
+        self.characteristics = characteristics
+
+    @property
+    def is_code(self):
+        return bool(self.characteristics & (IMAGE_SCN_CNT_CODE | IMAGE_SCN_MEM_EXECUTE))
+
+    def contains_rva(self, rva):
+        return self.virtual_address <= rva < self.virtual_address + max(self.virtual_size, self.raw_size)
+
+    def __repr__(self):
+        return f"Section({self.name!r}, rva=0x{self.virtual_address:X}, size=0x{self.virtual_size:X})"
+
+
+class PEHeaders:
+    def __init__(self, machine, is_pe32_plus, timestamp, size_of_image, data_directories, sections):
+        self.machine = machine
+        self.is_pe32_plus = is_pe32_plus
+        self.timestamp = timestamp
+        self.size_of_image = size_of_image
+        self.data_directories = data_directories
+        self.sections = sections
+
+    def section_for_rva(self, rva):
+        for section in self.sections:
+            if section.contains_rva(rva):
+                return section
+        return None
+
+    def rva_to_offset(self, rva):
+        section = self.section_for_rva(rva)
+        if section is None:
+            raise PEFormatError(f"RVA 0x{rva:X} is outside every section")
+        return section.raw_offset + (rva - section.virtual_address)
+
+    def code_sections(self):
+        return [s for s in self.sections if s.is_code]
+
+
+def parse_headers(data):
+    # data must cover the DOS header, NT headers and section table (first page is enough)
+    if len(data) < 0x40 or data[:2] != IMAGE_DOS_SIGNATURE:
+        raise PEFormatError("Missing MZ header")
+    e_lfanew = struct.unpack_from('<I', data, 0x3C)[0]
+    if data[e_lfanew:e_lfanew + 4] != IMAGE_NT_SIGNATURE:
+        raise PEFormatError("Missing PE signature")
+    coff = e_lfanew + 4
+    try:
+        machine, section_count, timestamp, _, _, optional_size, _ = struct.unpack_from('<HHIIIHH', data, coff)
+        optional = coff + 20
+        magic = struct.unpack_from('<H', data, optional)[0]
+        if magic == IMAGE_NT_OPTIONAL_HDR64_MAGIC:
+            is_pe32_plus = True
+            dir_count_offset = optional + 108
+        elif magic == IMAGE_NT_OPTIONAL_HDR32_MAGIC:
+            is_pe32_plus = False
+            dir_count_offset = optional + 92
+        else:
+            raise PEFormatError(f"Unknown optional header magic 0x{magic:X}")
+        size_of_image = struct.unpack_from('<I', data, optional + 56)[0]
+        dir_count = min(struct.unpack_from('<I', data, dir_count_offset)[0], 16)
+        data_directories = [struct.unpack_from('<II', data, dir_count_offset + 4 + i * 8) for i in range(dir_count)]
+
+        sections = []
+        table = optional + optional_size
+        for i in range(section_count):
+            entry = table + i * 40
+            raw_name, virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from('<8sIIII', data, entry)
+            characteristics = struct.unpack_from('<I', data, entry + 36)[0]
+            name = raw_name.rstrip(b'\x00').decode('ascii', 'replace')
+            sections.append(Section(name, virtual_address, virtual_size, raw_offset, raw_size, characteristics))
+    except struct.error as e:
+        raise PEFormatError(f"Truncated PE headers: {e}")
+    return PEHeaders(machine, is_pe32_plus, timestamp, size_of_image, data_directories, sections)
+
+
+def _resource_entries(rsrc, offset):
+    if offset + 16 > len(rsrc):
+        raise PEFormatError(f"Resource directory at 0x{offset:X} is outside the section")
+    named, ids = struct.unpack_from('<HH', rsrc, offset + 12)
+    if offset + 16 + (named + ids) * 8 > len(rsrc):
+        raise PEFormatError(f"Resource directory at 0x{offset:X} runs past the section")
+    for i in range(named + ids):
+        name, target = struct.unpack_from('<II', rsrc, offset + 16 + i * 8)
+        yield name, target
+
+
+def _find_resource(rsrc, rsrc_rva, type_id):
+    # Resource tree is type -> name -> language; take the first name and language under type_id
+    for name, target in _resource_entries(rsrc, 0):
+        if name & 0x80000000 or name != type_id:
+            continue
+        node = target
+        depth = 1
+        while node & 0x80000000:
+            # A well-formed tree is exactly three levels deep; anything deeper is a loop or garbage
+            if depth >= RESOURCE_DEPTH:
+                raise PEFormatError("Resource directory is nested too deeply")
+            subdir = node & 0x7FFFFFFF
+            entries = list(_resource_entries(rsrc, subdir))
+            if not entries:
+                return None
+            node = entries[0][1]
+            depth += 1
+        if node + 8 > len(rsrc):
+            raise PEFormatError(f"Resource data entry at 0x{node:X} is outside the section")
+        data_rva, size = struct.unpack_from('<II', rsrc, node)
+        start = data_rva - rsrc_rva
+        if start < 0 or start + size > len(rsrc):
+            raise PEFormatError(f"Resource data at RVA 0x{data_rva:X} is outside the section")
+        return rsrc[start:start + size]
+    return None
+
+
+def _align4(offset):
+    return (offset + 3) & ~3
+
+
+def _read_block(buf, offset, end=None):
+    # VS_VERSIONINFO / StringFileInfo / StringTable / String all share this header layout
+    end = len(buf) if end is None else min(end, len(buf))
+    if offset + 6 > end:
+        raise PEFormatError(f"Version block at 0x{offset:X} is truncated")
+    length, value_length, value_type = struct.unpack_from('<HHH', buf, offset)
+    if length == 0:
+        # Zero padding after the last child; callers stop on a zero length
+        return 0, 0, 0, "", offset + 6
+    if length < 6 or offset + length > end:
+        raise PEFormatError(f"Version block at 0x{offset:X} claims {length} bytes past the end of its parent")
+    key_start = offset + 6
+    key_end = key_start
+    block_end = offset + length
+    while key_end + 2 <= block_end and buf[key_end:key_end + 2] != b'\x00\x00':
+        key_end += 2
+    if key_end + 2 > block_end:
+        raise PEFormatError(f"Version block at 0x{offset:X} has an unterminated key")
+    key = buf[key_start:key_end].decode('utf-16-le', 'replace')
+    value_start = _align4(key_end + 2)
+    # value_length counts WCHARs for text values (type 1) and bytes for binary ones
+    value_size = value_length * 2 if value_type == 1 else value_length
+    if value_start + value_size > block_end and value_length:
+        raise PEFormatError(f"Version block at 0x{offset:X} has a value past its end")
+    return length, value_length, value_type, key, value_start
+
+
+def parse_version_info(blob):
+    if not blob or len(blob) < 6:
+        return None
+    length, value_length, _, key, value_start = _read_block(blob, 0)
+    if key != "VS_VERSION_INFO":
+        return None
+    info = {"fixed": None, "strings": {}}
+    if value_length >= 52:
+        fields = struct.unpack_from('<13I', blob, value_start)
+        if fields[0] == VS_FFI_SIGNATURE:
+            file_ms, file_ls, product_ms, product_ls = fields[2:6]
+            info["fixed"] = {
+                "file_version": f"{file_ms >> 16}.{file_ms & 0xFFFF}.{file_ls >> 16}.{file_ls & 0xFFFF}",
+                "product_version": f"{product_ms >> 16}.{product_ms & 0xFFFF}.{product_ls >> 16}.{product_ls & 0xFFFF}",
+            }
+    end = length
+    child = _align4(value_start + value_length)
+    while child + 6 <= end:
+        child_length, _, _, child_key, child_value = _read_block(blob, child, end)
+        if child_length == 0:
+            break
+        if child_key == "StringFileInfo":
+            table = child_value
+            while table + 6 <= child + child_length:
+                table_length, _, _, _, entry = _read_block(blob, table, child + child_length)
+                if table_length == 0:
+                    break
+                while entry + 6 <= table + table_length:
+                    entry_length, entry_value_length, _, name, text_start = _read_block(blob, entry, table + table_length)
+                    if entry_length == 0:
+                        break
+                    text = blob[text_start:text_start + entry_value_length * 2].decode('utf-16-le', 'replace')
+                    info["strings"][name] = text.rstrip('\x00')
+                    entry = _align4(entry + entry_length)
+                table = _align4(table + table_length)
+        child = _align4(child + child_length)
+    return info
+
+
+def read_version_info(path):
+    with open(path, 'rb') as f:
+        headers = parse_headers(f.read(HEADER_READ_SIZE))
+        if len(headers.data_directories) <= IMAGE_DIRECTORY_ENTRY_RESOURCE:
+            return None
+        rsrc_rva, rsrc_size = headers.data_directories[IMAGE_DIRECTORY_ENTRY_RESOURCE]
+        if not rsrc_rva or not rsrc_size:
+            return None
+        # Only the resource section is read, not the whole (very large) executable
+        f.seek(headers.rva_to_offset(rsrc_rva))
+        rsrc = f.read(rsrc_size)
+    try:
+        blob = _find_resource(rsrc, rsrc_rva, RT_VERSION)
+        return parse_version_info(blob)
+    except struct.error as e:
+        raise PEFormatError(f"Malformed version resource: {e}")
+
+
+def read_file_version(path):
+    info = read_version_info(path)
+    if not info:
+        return None
+    for key in ("ProductVersion", "FileVersion"):
+        if info["strings"].get(key):
+            return info["strings"][key]
+    if info["fixed"]:
+        return info["fixed"]["product_version"]
+    return None
@@ -0,0 +1,48 @@
+import struct
+
+# Lazy stages for turning raw signature matches into accepted addresses:
+#   float_values(matches) -> in_range(...) -> verified(...) -> first(...)
+# Nothing past the first accepted hit is read, filtered or written to unless the consumer asks for it.
+
+
+class AmbiguousMatch(ValueError):
+    def __init__(self, first, second):
+        super().__init__(f"more than one match: {first!r} and {second!r}")
+        self.first = first
+        self.second = second
+
+
+def float_values(matches, buffer):
+    # (address, offset) from RegionReader.scan -> (address, float at the match); read before the buffer moves on
+    for address, offset in matches:
+        yield address, struct.unpack_from('<f', buffer, offset)[0]
+
+
+def in_range(values, low, high):
+    for address, value in values:
+        if low <= value <= high:
+            yield address, value
+
+
+def verified(values, verify, cancel_token=None):
+    # verify(address) -> bool; a candidate whose check raises is dropped, the rest are still tried
+    for address, value in values:
+        if cancel_token is not None and cancel_token.cancelled:
+            return
+        try:
+            accepted = verify(address)
+        except Exception:
+            accepted = False
+        if accepted:
+            yield address, value
+
+
+def first(items, unique=False):
+    # Stops the pipeline at the first item; unique pulls exactly one more to rule out ambiguity
+    items = iter(items)
+    for item in items:
+        if unique:
+            for other in items:
+                raise AmbiguousMatch(item, other)
+        return item
+    return None
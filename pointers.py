@@ -0,0 +1,203 @@
+import json
+import os
+import struct
+import threading
+
+import metrics
+import tracing
+from peinfo import HEADER_READ_SIZE, parse_headers
+from relocate import build_key
+from scanner import resource_path
+
+POINTER_DB = "pointers.json"
+POINTER_FORMAT = 1
+POINTER_SIZE = 8
+BATCH_SPAN = 0x10000
+
+
+def _parse_int(value):
+    return int(value, 0) if isinstance(value, str) else int(value)
+
+
+class PointerChain:
+    # [[[base + rva] + offsets[0]] + offsets[1]] ... : every offset but the last is applied to a
+    # dereferenced pointer, the last one gives the value's address
+    __slots__ = ("name", "rva", "offsets")
+
+    def __init__(self, name, rva, offsets):
+        self.name = name
+        self.rva = rva
+        self.offsets = tuple(offsets)
+
+    @classmethod
+    def from_entry(cls, name, entry):
+        return cls(name, _parse_int(entry["rva"]), [_parse_int(o) for o in entry.get("offsets", ())])
+
+    def to_entry(self):
+        return {"rva": f"0x{self.rva:X}", "offsets": [f"0x{o:X}" for o in self.offsets]}
+
+    @property
+    def depth(self):
+        return len(self.offsets)
+
+    def __eq__(self, other):
+        return isinstance(other, PointerChain) and (self.rva, self.offsets) == (other.rva, other.offsets)
+
+    def __hash__(self):
+        return hash((self.rva, self.offsets))
+
+    def __str__(self):
+        text = f"base+0x{self.rva:X}"
+        for offset in self.offsets:
+            text = f"[{text}]+0x{offset:X}"
+        return text
+
+    def __repr__(self):
+        return f"PointerChain({self.name!r}, {self})"
+
+
+class PointerDatabase:
+    # Chains are only valid for the exact build they were found on, so they are keyed by build_key
+    _shared_instance = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls(resource_path(POINTER_DB))
+            return cls._shared_instance
+
+    def __init__(self, path=POINTER_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                db = json.load(f)
+            if db.get("format") == POINTER_FORMAT:
+                return db
+        except (OSError, ValueError):
+            pass
+        return {"format": POINTER_FORMAT, "builds": {}}
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._db, f, indent=4)
+            os.replace(tmp_path, self.path)
+
+    def chains(self, build, name):
+        with self._lock:
+            entries = self._db["builds"].get(build, {}).get(name, [])
+        return [PointerChain.from_entry(name, entry) for entry in entries]
+
+    def store(self, build, name, chains):
+        with self._lock:
+            self._db["builds"].setdefault(build, {})[name] = [chain.to_entry() for chain in chains]
+
+    def builds(self):
+        with self._lock:
+            return list(self._db["builds"])
+
+
+class PointerResolver:
+    # The static slots of all requested chains usually sit in one data section, so they are fetched
+    # with a single read; a pointer shared by several chains is dereferenced once
+    def __init__(self, pm, base):
+        self.pm = pm
+        self.base = base
+        self.reads = 0
+        self._pointers = {}
+
+    def read_pointer(self, address):
+        value = self._pointers.get(address)
+        if value is None:
+            value = struct.unpack('<Q', self.pm.read_bytes(address, POINTER_SIZE))[0]
+            self.reads += 1
+            self._pointers[address] = value
+        return value
+
+    def prefetch(self, chains):
+        slots = sorted({self.base + chain.rva for chain in chains if chain.offsets})
+        if len(slots) < 2 or slots[-1] + POINTER_SIZE - slots[0] > BATCH_SPAN:
+            return
+        start = slots[0]
+        data = self.pm.read_bytes(start, slots[-1] + POINTER_SIZE - start)
+        self.reads += 1
+        for slot in slots:
+            self._pointers[slot] = struct.unpack_from('<Q', data, slot - start)[0]
+
+    def resolve(self, chain):
+        if not chain.offsets:
+            return self.base + chain.rva
+        address = self.base + chain.rva
+        for offset in chain.offsets[:-1]:
+            pointer = self.read_pointer(address)
+            if not pointer:
+                return None
+            address = pointer + offset
+        pointer = self.read_pointer(address)
+        if not pointer:
+            return None
+        return pointer + chain.offsets[-1]
+
+    def resolve_all(self, chains):
+        self.prefetch(chains)
+        results = []
+        for chain in chains:
+            try:
+                results.append(self.resolve(chain))
+            except Exception:
+                results.append(None)
+        return results
+
+
+def _verified_targets(pm, base, signature, low, high, chains):
+    # Lazily yields (address, value) for each distinct chain target that still carries the heap
+    # signature and an in-range float
+    seen = set()
+    resolver = PointerResolver(pm, base)
+    for address in resolver.resolve_all(chains):
+        if address is None or address in seen:
+            continue
+        seen.add(address)
+        try:
+            site = pm.read_bytes(address, signature.length)
+        except Exception:
+            continue
+        if not signature.matches_at(site, 0):
+            continue
+        value = struct.unpack_from('<f', site)[0]
+        if low <= value <= high:
+            yield address, value
+
+
+def resolve_values(pm, base, signature, low, high, feature=None, database=None, limit=None):
+    # Every copy the known chains reach (values like the gamma live in several places), or [] when this
+    # build has no usable chain; `limit` stops after that many
+    if signature is None:
+        return []
+    controller = feature or signature.name
+    database = database or PointerDatabase.shared()
+    headers = parse_headers(pm.read_bytes(base, HEADER_READ_SIZE))
+    chains = database.chains(build_key(headers), signature.name)
+    if not chains:
+        return []
+    with tracing.tracer.span("pointer_resolve", controller=controller, signature=signature.name):
+        found = []
+        for hit in _verified_targets(pm, base, signature, low, high, chains):
+            found.append(hit)
+            if limit is not None and len(found) >= limit:
+                break
+    metrics.registry.counter("pointer.hits" if found else "pointer.misses", controller).inc()
+    return found
+
+
+def resolve_value(pm, base, signature, low, high, feature=None, database=None):
+    # Returns (address, value) for the first known chain that still lands on the value, or None
+    found = resolve_values(pm, base, signature, low, high, feature, database, limit=1)
+    return found[0] if found else None
@@ -0,0 +1,215 @@
+import argparse
+import bisect
+import struct
+import sys
+
+from pointers import POINTER_DB, POINTER_SIZE, PointerChain, PointerDatabase, PointerResolver
+from relocate import np
+from scanner import resource_path
+from snapshot import Snapshot, SNAPSHOT_SUFFIX, capture, target_map
+from version_detector import PROCESS_NAME
+
+EXECUTE_PROTECTIONS = 0x10 | 0x20 | 0x40 | 0x80
+DEFAULT_DEPTH = 4
+DEFAULT_MAX_OFFSET = 0x1000
+MAX_FRONTIER = 100000
+MAX_CHAINS = 5000
+KEEP_CHAINS = 3
+
+
+class MemoryImage:
+    # The non-executable regions of a snapshot, inflated once for the pointer map. read_bytes mirrors
+    # pymem's so PointerResolver runs on it unchanged.
+    def __init__(self, module_base, module_size, regions, targets=None, build=None):
+        self.module_base = module_base
+        self.module_size = module_size
+        self.regions = sorted(regions, key=lambda region: region[0])
+        self.bases = [base for base, _ in self.regions]
+        self.targets = targets or {}
+        self.build = build
+
+    @classmethod
+    def load(cls, path):
+        with Snapshot(path) as snap:
+            regions = [(region.base, snap.read_region(region)) for region in snap.regions
+                       if not region.protect & EXECUTE_PROTECTIONS]
+            meta = snap.metadata
+            targets = snap.targets
+        return cls(meta["module_base"], meta["module_size"], regions, targets, meta.get("build"))
+
+    def is_static(self, address):
+        return self.module_base <= address < self.module_base + self.module_size
+
+    def read_bytes(self, address, length):
+        index = bisect.bisect_right(self.bases, address) - 1
+        if index >= 0:
+            base, data = self.regions[index]
+            offset = address - base
+            if offset + length <= len(data):
+                return bytes(data[offset:offset + length])
+        raise OSError(f"0x{address:X} is not in the snapshot")
+
+
+def pointer_map(image):
+    # Every aligned qword in the snapshot whose value lands inside a captured region, sorted by that value
+    starts = [base for base, _ in image.regions]
+    ends = [base + len(data) for base, data in image.regions]
+    if np is not None:
+        bases = np.array(starts, dtype=np.uint64)
+        limits = np.array(ends, dtype=np.uint64)
+        values, holders = [], []
+        for base, data in image.regions:
+            words = np.frombuffer(data, dtype='<u8', count=len(data) // POINTER_SIZE)
+            index = np.searchsorted(bases, words, side='right').astype(np.int64) - 1
+            inside = (index >= 0) & (words < limits[np.maximum(index, 0)])
+            hits = np.nonzero(inside)[0]
+            values.append(words[hits])
+            holders.append(np.uint64(base) + hits.astype(np.uint64) * np.uint64(POINTER_SIZE))
+        if not values:
+            return np.zeros(0, np.uint64), np.zeros(0, np.uint64)
+        values = np.concatenate(values)
+        holders = np.concatenate(holders)
+        order = np.argsort(values, kind='stable')
+        return values[order], holders[order]
+    pairs = []
+    for base, data in image.regions:
+        for i, (word,) in enumerate(struct.iter_unpack('<Q', data[:len(data) // POINTER_SIZE * POINTER_SIZE])):
+            index = bisect.bisect_right(starts, word) - 1
+            if index >= 0 and word < ends[index]:
+                pairs.append((word, base + i * POINTER_SIZE))
+    pairs.sort()
+    return [value for value, _ in pairs], [holder for _, holder in pairs]
+
+
+def find_chains(image, name, target, depth=DEFAULT_DEPTH, max_offset=DEFAULT_MAX_OFFSET, pointers=None):
+    # Walks backwards from the target: each level looks for pointers to just below the current address
+    # until a pointer stored inside the module image (a static slot) is reached
+    values, holders = pointers if pointers is not None else pointer_map(image)
+    chains = []
+    frontier = [(target, ())]
+    seen = {target}
+    for _ in range(depth):
+        next_frontier = []
+        for address, tail in frontier:
+            if np is not None and isinstance(values, np.ndarray):
+                lo = int(np.searchsorted(values, np.uint64(max(0, address - max_offset)), side='left'))
+                hi = int(np.searchsorted(values, np.uint64(address), side='right'))
+            else:
+                lo = bisect.bisect_left(values, max(0, address - max_offset))
+                hi = bisect.bisect_right(values, address)
+            for i in range(lo, hi):
+                holder = int(holders[i])
+                offsets = (address - int(values[i]),) + tail
+                if image.is_static(holder):
+                    chains.append(PointerChain(name, holder - image.module_base, offsets))
+                    if len(chains) >= MAX_CHAINS:
+                        return _ranked(chains)
+                elif holder not in seen and len(next_frontier) < MAX_FRONTIER:
+                    seen.add(holder)
+                    next_frontier.append((holder, offsets))
+        frontier = next_frontier
+        if not frontier:
+            break
+    return _ranked(chains)
+
+
+def _ranked(chains):
+    # Short chains with small offsets survive game updates and world reloads best
+    return sorted(set(chains), key=lambda chain: (chain.depth, sum(chain.offsets), chain.rva))
+
+
+def stable_chains(chains, images):
+    # Keeps only the chains that land on one of the recorded targets (copies) in every other capture
+    kept = []
+    for chain in chains:
+        for image, targets in images:
+            try:
+                if PointerResolver(image, image.module_base).resolve(chain) not in targets:
+                    break
+            except OSError:
+                break
+        else:
+            kept.append(chain)
+    return kept
+
+
+def _parse_target(text):
+    name, _, address = text.partition("=")
+    if not address:
+        raise argparse.ArgumentTypeError(f"expected NAME=ADDRESS, got {text!r}")
+    return name, int(address, 0)
+
+
+def _image_targets(image, path, name, override):
+    targets = override or image.targets.get(name)
+    if not targets:
+        raise ValueError(f"{path} has no target for {name}; pass --target or capture with --target")
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture snapshots of the game and search them for stable pointer chains")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    capture_parser = commands.add_parser("capture", help="snapshot the running game")
+    capture_parser.add_argument("output", help=f"snapshot file ({SNAPSHOT_SUFFIX})")
+    capture_parser.add_argument("--target", action="append", type=_parse_target, default=[],
+                                help="NAME=ADDRESS of a value to record in the snapshot, e.g. zoom.fov=0x1F00F797EF4; "
+                                     "repeat a name for every copy")
+
+    scan_parser = commands.add_parser("scan", help="find chains to a value that hold across several snapshots")
+    scan_parser.add_argument("name", help="signature name, e.g. zoom.fov")
+    scan_parser.add_argument("snapshots", nargs="+", help="snapshot files; the first one is searched")
+    scan_parser.add_argument("--target", action="append", type=lambda text: int(text, 0), default=[],
+                             help="address in the first snapshot; repeat for every copy of the value")
+    scan_parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    scan_parser.add_argument("--max-offset", type=lambda text: int(text, 0), default=DEFAULT_MAX_OFFSET)
+    scan_parser.add_argument("--keep", type=int, default=KEEP_CHAINS, help="chains stored per copy")
+    scan_parser.add_argument("--write", action="store_true", help=f"store the best chains in {POINTER_DB}")
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        import pymem
+
+        pm = pymem.Pymem(PROCESS_NAME)
+        writer = capture(pm, args.output, targets=target_map(args.target))
+        print(f"Captured {len(writer.regions)} regions ({writer.raw_bytes / (1 << 20):.1f} MB) of build "
+              f"{writer.metadata['build']} to {args.output}")
+        return 0
+
+    images = [MemoryImage.load(path) for path in args.snapshots]
+    first = images[0]
+    targets = _image_targets(first, args.snapshots[0], args.name, args.target)
+    others = [(image, _image_targets(image, path, args.name, None)) for image, path in zip(images[1:], args.snapshots[1:])]
+    pointers = pointer_map(first)
+    # One set of chains per copy, so a resolved build finds every copy and not just the first
+    chains = []
+    for target in targets:
+        found = find_chains(first, args.name, target, depth=args.depth, max_offset=args.max_offset, pointers=pointers)
+        print(f"{len(found)} chains to 0x{target:X} in {args.snapshots[0]}")
+        if others:
+            found = stable_chains(found, others)
+            print(f"{len(found)} chains to 0x{target:X} hold in all {len(images)} snapshots")
+        for chain in found[:20]:
+            print(f"  {chain}")
+        for chain in found[:args.keep]:
+            if chain not in chains:
+                chains.append(chain)
+    if args.write and chains:
+        builds = {image.build for image in images}
+        if len(builds) != 1 or None in builds:
+            print(f"Snapshots come from different builds ({', '.join(map(str, builds))}); not writing")
+            return 1
+        database = PointerDatabase(resource_path(POINTER_DB))
+        database.store(first.build, args.name, chains)
+        database.save()
+        print(f"Stored {len(chains)} chains for {args.name} on build {first.build} in {POINTER_DB}")
+    return 0 if chains else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except (OSError, ValueError) as e:
+        print(f"Pointer scan failed: {e}")
+        sys.exit(1)
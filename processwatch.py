@@ -0,0 +1,87 @@
+import ctypes
+from ctypes import wintypes
+import threading
+
+WAIT_OBJECT_0 = 0x00000000
+WAIT_TIMEOUT = 0x00000102
+
+
+class ProcessExitWatcher:
+    def __init__(self, process_handle, poll_interval_ms=250):
+        self.process_handle = process_handle
+        self.poll_interval_ms = poll_interval_ms
+        self.exited = threading.Event()
+        self._stop = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def on_exit(self, callback):
+        with self._lock:
+            if not self.exited.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _watch(self):
+        WaitForSingleObject = ctypes.WinDLL("kernel32", use_last_error=True).WaitForSingleObject
+        WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        WaitForSingleObject.restype = wintypes.DWORD
+        while not self._stop.is_set():
+            result = WaitForSingleObject(self.process_handle, self.poll_interval_ms)
+            if result == WAIT_TIMEOUT:
+                continue
+            # WAIT_OBJECT_0 means the process is gone; WAIT_FAILED means the handle is unusable
+            self._fire()
+            return
+
+    def _fire(self):
+        with self._lock:
+            self.exited.set()
+            callbacks = self._callbacks
+            self._callbacks = []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+
+class SessionEpoch:
+    # Bumped when the game exits, a new process is attached, or any controller's real read/write fails.
+    # Controllers remember the epoch they last validated at and skip the syscalls while it is unchanged.
+    _shared_instance = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def __init__(self):
+        self.epoch = 1
+        self.last_reason = None
+        self._lock = threading.Lock()
+
+    def invalidate(self, reason=None):
+        with self._lock:
+            self.epoch += 1
+            self.last_reason = reason
+            return self.epoch
+
+    def watch(self, watcher):
+        watcher.on_exit(lambda: self.invalidate("process exited"))
@@ -0,0 +1,176 @@
+import collections
+import os
+import sys
+import threading
+import time
+import psutil
+
+PROFILE_FILE = "profile.folded"
+THREAD_CPU_FILE = "profile.cpu"
+DEFAULT_HZ = 200
+MAX_DEPTH = 64
+# Windows advances thread CPU time only on the ~15.6 ms clock tick, so it is read over a longer window
+# than one sample; Process.threads() also snapshots every process on the system, too slow for each tick
+CPU_WINDOW = 0.5
+
+
+def _frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    # Walks every thread's stack at a fixed rate and counts collapsed stacks (flamegraph.pl / speedscope input)
+    def __init__(self, hz=DEFAULT_HZ):
+        self.hz = hz
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.overruns = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._labels = {}
+        self._process = psutil.Process(os.getpid())
+        self._cpu = {}
+        self._cpu_at = None
+        self.thread_cpu = collections.Counter()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, hz=None):
+        if self.running:
+            return False
+        if hz:
+            self.hz = hz
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if not self.running:
+            return False
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        self._account_cpu()
+        self.elapsed += time.perf_counter() - self.started
+        return True
+
+    def reset(self):
+        with self._lock:
+            self.stacks = collections.Counter()
+            self.samples = 0
+            self.overruns = 0
+            self.elapsed = 0.0
+            self.thread_cpu = collections.Counter()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code)
+        return label
+
+    def _run(self):
+        interval = 1.0 / self.hz
+        own = threading.get_ident()
+        deadline = time.perf_counter()
+        self._cpu = self._cpu_times()
+        self._cpu_at = deadline
+        while not self._stop.is_set():
+            self.sample(skip=own)
+            if time.perf_counter() - self._cpu_at >= CPU_WINDOW:
+                self._account_cpu()
+            deadline += interval
+            delay = deadline - time.perf_counter()
+            if delay < 0:
+                # Fell behind (GIL contention or a slow walk): skip the missed ticks instead of bursting
+                self.overruns += 1
+                deadline = time.perf_counter()
+                delay = 0
+            self._stop.wait(delay)
+
+    def _cpu_times(self):
+        try:
+            return {thread.id: thread.user_time + thread.system_time for thread in self._process.threads()}
+        except (psutil.Error, OSError):
+            return {}
+
+    def _account_cpu(self):
+        # Adds each thread's CPU time since the last window to its running total
+        cpu = self._cpu_times()
+        names = {thread.native_id: thread.name for thread in threading.enumerate()}
+        totals = collections.Counter()
+        for native_id, seconds in cpu.items():
+            previous = self._cpu.get(native_id)
+            if previous is not None and seconds > previous:
+                totals[names.get(native_id, f"native-{native_id}")] += seconds - previous
+        self._cpu = cpu
+        self._cpu_at = time.perf_counter()
+        with self._lock:
+            self.thread_cpu.update(totals)
+
+    def sample(self, skip=None):
+        threads = {thread.ident: thread for thread in threading.enumerate()}
+        collected = []
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            thread = threads.get(ident)
+            stack.append(thread.name if thread else f"thread-{ident}")
+            stack.reverse()
+            collected.append(";".join(stack))
+        with self._lock:
+            self.samples += 1
+            self.stacks.update(collected)
+
+    def collapsed(self):
+        with self._lock:
+            return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+    def cpu_report(self):
+        # CPU seconds per thread and the share of the profiled wall time each one burned
+        elapsed = self.elapsed + (time.perf_counter() - self.started if self.running else 0.0)
+        with self._lock:
+            totals = self.thread_cpu.most_common()
+        return [f"{name} {seconds:.3f}s {seconds / elapsed * 100 if elapsed else 0.0:.1f}%" for name, seconds in totals]
+
+    def _write(self, path, lines):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+            if lines:
+                f.write("\n")
+        os.replace(tmp_path, path)
+
+    def dump(self, path=PROFILE_FILE, cpu_path=THREAD_CPU_FILE):
+        self._write(path, self.collapsed())
+        self._write(cpu_path, self.cpu_report())
+        return path
+
+    def summary(self):
+        return f"{self.samples} samples at {self.hz} Hz, {self.overruns} overruns, {len(self.stacks)} unique stacks"
+
+
+profiler = SamplingProfiler()
+
+
+def parse_hz(argv):
+    # --profile or --profile=HZ
+    for arg in argv:
+        if arg == "--profile":
+            return DEFAULT_HZ
+        if arg.startswith("--profile="):
+            try:
+                return max(1, int(arg.split("=", 1)[1]))
+            except ValueError:
+                return DEFAULT_HZ
+    return None
@@ -0,0 +1,382 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import metrics
+import tracing
+from peinfo import HEADER_READ_SIZE, PEFormatError, parse_headers
+from pipeline import AmbiguousMatch, first
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CACHE_FILE = "signature_cache.json"
+CACHE_FORMAT = 1
+MAX_CACHED_BUILDS = 4
+
+DEFAULT_RADIUS = 0x400000
+DEFAULT_BUDGET = 0.5
+DEFAULT_MAX_CANDIDATES = 200000
+# Below this many literal bytes the pigeonhole blocks are 2-3 bytes long and a large image has
+# thousands of equally close sites, so a short hook signature is never relocated fuzzily
+MIN_FUZZY_LITERALS = 12
+SCORE_BATCH = 16384
+CONFIRM_TIMEOUT = 60.0
+
+
+def build_key(headers):
+    return f"{headers.timestamp:08X}-{headers.size_of_image:X}"
+
+
+def build_id(data):
+    # TimeDateStamp + SizeOfImage from the in-memory headers identify a game build without touching the disk
+    try:
+        headers = parse_headers(bytes(data[:HEADER_READ_SIZE]))
+    except PEFormatError:
+        return None
+    return build_key(headers)
+
+
+class Candidate:
+    __slots__ = ("offset", "distance", "literal_count")
+
+    def __init__(self, offset, distance, literal_count):
+        self.offset = offset
+        self.distance = distance
+        self.literal_count = literal_count
+
+    @property
+    def similarity(self):
+        return 1.0 - self.distance / self.literal_count
+
+    def __repr__(self):
+        return f"Candidate(offset=0x{self.offset:X}, distance={self.distance}/{self.literal_count})"
+
+
+class RelocationStats:
+    def __init__(self, name, max_distance, backend):
+        self.name = name
+        self.max_distance = max_distance
+        self.backend = backend
+        self.elapsed = 0.0
+        self.bytes_searched = 0
+        self.candidates = 0
+        self.truncated = False
+        self.best = None
+        self.ties = 0
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "max_distance": self.max_distance,
+            "backend": self.backend,
+            "elapsed_ms": round(self.elapsed * 1000, 3),
+            "bytes_searched": self.bytes_searched,
+            "candidates": self.candidates,
+            "truncated": self.truncated,
+            "best_offset": self.best.offset if self.best else None,
+            "best_distance": self.best.distance if self.best else None,
+            "ties": self.ties,
+        }
+
+    def __str__(self):
+        mb = self.bytes_searched / (1024 * 1024)
+        best = f"best {self.best.distance}/{self.best.literal_count} at +0x{self.best.offset:X}" if self.best else "no candidate"
+        note = ", truncated" if self.truncated else ""
+        if self.ties:
+            best += f" (tied with {self.ties} other site(s))"
+        return (f"Relocate {self.name}: {best}, {self.candidates} candidates, "
+                f"{mb:.1f} MB in {self.elapsed * 1000:.1f} ms ({self.backend}{note})")
+
+
+def split_literals(signature, pieces):
+    # Pigeonhole filter: with fewer than `pieces` mismatches, at least one of `pieces` disjoint blocks matches exactly
+    blocks = list(signature.segments)
+    while len(blocks) < pieces:
+        i = max(range(len(blocks)), key=lambda k: len(blocks[k][1]))
+        offset, literal = blocks[i]
+        if len(literal) < 2:
+            break
+        half = len(literal) // 2
+        blocks[i:i + 1] = [(offset, literal[:half]), (offset + half, literal[half:])]
+    return blocks
+
+
+def _collect(data, blocks, length, lo, hi, limit, deadline):
+    starts = set()
+    last_start = hi - length
+    if last_start < lo:
+        return starts, False
+    for offset, literal in blocks:
+        pos = lo + offset
+        end = last_start + offset + len(literal)
+        while True:
+            hit = data.find(literal, pos, end)
+            if hit == -1:
+                break
+            starts.add(hit - offset)
+            if len(starts) >= limit or time.perf_counter() > deadline:
+                return starts, True
+            pos = hit + 1
+    return starts, False
+
+
+def _score(data, starts, positions, literals):
+    if np is not None:
+        buf = np.frombuffer(data, dtype=np.uint8)
+        cols = np.asarray(positions, dtype=np.int64)
+        expected = np.frombuffer(literals, dtype=np.uint8)
+        ordered = np.fromiter(starts, dtype=np.int64, count=len(starts))
+        distances = np.empty(len(ordered), dtype=np.int64)
+        for i in range(0, len(ordered), SCORE_BATCH):
+            window = buf[ordered[i:i + SCORE_BATCH, None] + cols]
+            distances[i:i + SCORE_BATCH] = (window != expected).sum(axis=1)
+        return list(zip(ordered.tolist(), distances.tolist()))
+    scored = []
+    for start in starts:
+        distance = 0
+        for position, expected in zip(positions, literals):
+            if data[start + position] != expected:
+                distance += 1
+        scored.append((start, distance))
+    return scored
+
+
+def fuzzy_search(data, signature, max_distance=None, center=None, radius=DEFAULT_RADIUS,
+                 budget=DEFAULT_BUDGET, max_candidates=DEFAULT_MAX_CANDIDATES, top=5):
+    positions = [i for i, literal in enumerate(signature.mask) if literal]
+    literals = bytes(signature.pattern[i] for i in positions)
+    if max_distance is None:
+        max_distance = max(1, len(positions) // 8)
+    blocks = split_literals(signature, max_distance + 1)
+    max_distance = min(max_distance, len(blocks) - 1)
+
+    stats = RelocationStats(signature.name, max_distance, "numpy" if np is not None else "python")
+    started = time.perf_counter()
+    deadline = started + budget
+
+    # Neighbourhood of the last known RVA first; the whole image only if that finds nothing
+    windows = []
+    if center is not None:
+        windows.append((max(0, center - radius), min(len(data), center + radius + signature.length)))
+    windows.append((0, len(data)))
+
+    ranked = []
+    for lo, hi in windows:
+        starts, truncated = _collect(data, blocks, signature.length, lo, hi, max_candidates, deadline)
+        stats.bytes_searched += hi - lo
+        stats.candidates += len(starts)
+        stats.truncated = stats.truncated or truncated
+        ranked = [(start, distance) for start, distance in _score(data, starts, positions, literals)
+                  if distance <= max_distance]
+        if ranked or time.perf_counter() > deadline:
+            break
+
+    anchor = center if center is not None else 0
+    ranked.sort(key=lambda item: (item[1], abs(item[0] - anchor)))
+    candidates = [Candidate(start, distance, len(positions)) for start, distance in ranked[:top]]
+    if candidates:
+        stats.best = candidates[0]
+        stats.ties = sum(1 for _, distance in ranked[1:] if distance == candidates[0].distance)
+    stats.elapsed = time.perf_counter() - started
+    return candidates, stats
+
+
+class RelocationRequest:
+    def __init__(self, feature, signature, candidate, stats):
+        self.feature = feature
+        self.signature = signature
+        self.candidate = candidate
+        self.stats = stats
+        self.accepted = None
+        self._answered = threading.Event()
+
+    def answer(self, accepted):
+        self.accepted = bool(accepted)
+        self._answered.set()
+
+    def wait(self, cancel_token=None, timeout=CONFIRM_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while not self._answered.wait(0.1):
+            if (cancel_token is not None and cancel_token.cancelled) or time.monotonic() > deadline:
+                return False
+        return self.accepted
+
+
+class SignatureRelocator:
+    _shared_instance = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, cache_path=CACHE_FILE):
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls(cache_path)
+            return cls._shared_instance
+
+    def __init__(self, cache_path=CACHE_FILE, budget=DEFAULT_BUDGET, radius=DEFAULT_RADIUS,
+                 max_candidates=DEFAULT_MAX_CANDIDATES):
+        self.cache_path = cache_path
+        self.budget = budget
+        self.radius = radius
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+        self._confirm_lock = threading.Lock()
+        self._confirm_handler = None
+        self._declined = set()
+        self.history = deque(maxlen=32)
+        self._cache = self._load()
+
+    def set_confirm_handler(self, handler):
+        self._confirm_handler = handler
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("format") == CACHE_FORMAT:
+                return cache
+        except (OSError, ValueError):
+            pass
+        return {"format": CACHE_FORMAT, "builds": {}, "last": {}}
+
+    def _save(self):
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, indent=4)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Failed to save signature cache: {e}")
+
+    def _remember(self, build, signature, data, rva, confirmed):
+        self.remember_site(build, signature, rva, data[rva:rva + signature.length], confirmed)
+
+    def remember_site(self, build, signature, rva, site, confirmed=False):
+        if build is None:
+            return
+        entry = {"rva": rva, "bytes": bytes(site).hex(), "confirmed": confirmed}
+        with self._lock:
+            builds = self._cache["builds"]
+            if builds.get(build, {}).get(signature.name) == entry:
+                return
+            builds.setdefault(build, {})[signature.name] = entry
+            while len(builds) > MAX_CACHED_BUILDS:
+                del builds[next(iter(builds))]
+            self._cache["last"][signature.name] = {"rva": rva, "build": build}
+            self._save()
+
+    def cached_rva(self, build, name):
+        with self._lock:
+            entry = self._cache["builds"].get(build, {}).get(name)
+        return entry["rva"] if entry else None
+
+    def last_rva(self, name):
+        with self._lock:
+            last = self._cache["last"].get(name)
+        return last["rva"] if last else None
+
+    def _cached_site(self, build, signature, data):
+        # A site confirmed earlier on this exact build is reused only if its bytes are unchanged
+        with self._lock:
+            entry = self._cache["builds"].get(build, {}).get(signature.name)
+        if not entry or not entry.get("confirmed"):
+            return None
+        rva = entry["rva"]
+        if bytes(data[rva:rva + signature.length]).hex() != entry["bytes"]:
+            return None
+        return rva
+
+    def resolve(self, signature, data, feature=None, cancel_token=None, fuzzy=True, unique=False):
+        # unique: keep scanning past the first match once, and refuse a pattern that occurs twice
+        if signature is None:
+            return []
+        controller = feature or signature.name
+        metrics.registry.counter("scan.bytes", controller).inc(len(data))
+        with metrics.registry.timer("scan.duration", controller), \
+                tracing.tracer.span("resolve", controller=controller, signature=signature.name, size=len(data)):
+            try:
+                match = first(signature.iter_matches(data), unique)
+            except AmbiguousMatch as e:
+                metrics.registry.counter("scan.ambiguous", controller).inc()
+                print(f"{signature.name}: pattern matches at +0x{e.first:X} and +0x{e.second:X}; not patching")
+                return []
+            matches = [] if match is None else [match]
+        build = build_id(data) if signature.region == "module" else None
+        if matches:
+            self._remember(build, signature, data, matches[0], confirmed=False)
+            return matches
+        if build is None:
+            return []
+        cached = self._cached_site(build, signature, data)
+        if cached is not None:
+            print(f"{signature.name}: using confirmed relocation at +0x{cached:X}")
+            return [cached]
+        if not fuzzy or (build, signature.name) in self._declined:
+            return []
+        literal_count = sum(1 for literal in signature.mask if literal)
+        if literal_count < MIN_FUZZY_LITERALS:
+            print(f"{signature.name}: only {literal_count} literal bytes; too short to relocate safely")
+            self._declined.add((build, signature.name))
+            return []
+
+        with metrics.registry.timer("scan.fuzzy_duration", controller), \
+                tracing.tracer.span("fuzzy_search", controller=controller, signature=signature.name):
+            candidates, stats = fuzzy_search(data, signature, center=self.last_rva(signature.name), radius=self.radius,
+                                             budget=self.budget, max_candidates=self.max_candidates)
+        self.history.append(stats)
+        print(stats)
+        if candidates and stats.ties:
+            # Several sites are equally close: offering the first one would be a guess
+            metrics.registry.counter("scan.fuzzy_ties", controller).inc()
+            print(f"{signature.name}: {stats.ties + 1} sites tie at distance {candidates[0].distance}; not relocating")
+            candidates = []
+        if candidates and self._confirm(controller, signature, candidates[0], stats, cancel_token):
+            self._remember(build, signature, data, candidates[0].offset, confirmed=True)
+            return [candidates[0].offset]
+        self._declined.add((build, signature.name))
+        return []
+
+    def resolve_code(self, pm, base, signature, feature=None):
+        # Reads the game image's code sections only, straight from the process. On a build seen before
+        # the cached RVA is checked with a single small read and no section is scanned at all.
+        if signature is None:
+            return None
+        controller = feature or signature.name
+        headers = parse_headers(pm.read_bytes(base, HEADER_READ_SIZE))
+        build = build_key(headers)
+        rva = self.cached_rva(build, signature.name)
+        if rva is not None:
+            site = pm.read_bytes(base + rva, signature.length)
+            if signature.matches_at(site, 0):
+                metrics.registry.counter("scan.cache_hits", controller).inc()
+                return rva
+        for section in headers.code_sections():
+            size = section.virtual_size or section.raw_size
+            metrics.registry.counter("scan.bytes", controller).inc(size)
+            with metrics.registry.timer("scan.duration", controller), \
+                    tracing.tracer.span("resolve", controller=controller, signature=signature.name,
+                                        section=section.name, size=size):
+                data = pm.read_bytes(base + section.virtual_address, size)
+                match = signature.find(data)
+            if match != -1:
+                rva = section.virtual_address + match
+                self.remember_site(build, signature, rva, data[match:match + signature.length])
+                return rva
+        return None
+
+    def _confirm(self, feature, signature, candidate, stats, cancel_token):
+        handler = self._confirm_handler
+        if handler is None:
+            return False
+        # One dialog at a time even if several controllers fail together
+        with self._confirm_lock:
+            if cancel_token is not None and cancel_token.cancelled:
+                return False
+            request = RelocationRequest(feature, signature, candidate, stats)
+            handler(request)
+            return bool(request.wait(cancel_token))
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import sys
+
+SIGNATURE_DB = "signatures.json"
+COMMON_SERIES = "*"
+
+
+def resource_path(relative_path):
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), relative_path)
+
+
+class Signature:
+    __slots__ = ("name", "region", "offset", "length", "pattern", "mask", "anchor", "anchor_offset", "segments", "skip")
+
+    def __init__(self, name, region, offset, length, pattern, mask, anchor, anchor_offset, segments, skip):
+        self.name = name
+        self.region = region
+        self.offset = offset
+        self.length = length
+        self.pattern = pattern
+        self.mask = mask
+        self.anchor = anchor
+        self.anchor_offset = anchor_offset
+        self.segments = segments
+        self.skip = skip
+
+    @property
+    def solid(self):
+        return len(self.segments) == 1 and self.segments[0][1] == self.pattern
+
+    def matches_at(self, data, start):
+        if start < 0 or start + self.length > len(data):
+            return False
+        for seg_offset, literal in self.segments:
+            if data[start + seg_offset:start + seg_offset + len(literal)] != literal:
+                return False
+        return True
+
+    def iter_matches(self, data, start=0, end=None):
+        # Locate the rarest literal run with bytes.find (C speed), then verify the remaining segments
+        end = len(data) if end is None else min(end, len(data))
+        anchor, anchor_offset = self.anchor, self.anchor_offset
+        pos = start + anchor_offset
+        limit = end - self.length + anchor_offset
+        while True:
+            hit = data.find(anchor, pos, limit + len(anchor))
+            if hit == -1:
+                return
+            candidate = hit - anchor_offset
+            if self.solid or self.matches_at(data, candidate):
+                yield candidate
+            pos = hit + 1
+
+    def scan(self, data, start=0, end=None, limit=None):
+        matches = []
+        for match in self.iter_matches(data, start, end):
+            matches.append(match)
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+    def find(self, data, start=0, end=None):
+        for match in self.iter_matches(data, start, end):
+            return match
+        return -1
+
+    def scan_horspool(self, data, start=0, end=None, limit=None):
+        # Pure-Python Boyer-Moore-Horspool over the full masked pattern; kept as a reference strategy
+        end = len(data) if end is None else min(end, len(data))
+        matches = []
+        last = self.length - 1
+        skip = self.skip
+        pattern, mask = self.pattern, self.mask
+        pos = start
+        while pos + last < end:
+            i = last
+            while i >= 0 and (not mask[i] or data[pos + i] == pattern[i]):
+                i -= 1
+            if i < 0:
+                matches.append(pos)
+                if limit is not None and len(matches) >= limit:
+                    break
+            pos += skip[data[pos + last]]
+        return matches
+
+    def __repr__(self):
+        return f"Signature({self.name!r}, region={self.region!r}, length={self.length})"
+
+
+def parse_pattern(text):
+    pattern = bytearray()
+    mask = bytearray()
+    for token in text.split():
+        if token in ("??", "?"):
+            pattern.append(0)
+            mask.append(0)
+        else:
+            pattern.append(int(token, 16))
+            mask.append(1)
+    if not pattern or not any(mask):
+        raise ValueError(f"Signature has no literal bytes: {text!r}")
+    return bytes(pattern), bytes(mask)
+
+
+def build_table(pattern, mask):
+    segments = []
+    i = 0
+    while i < len(pattern):
+        if not mask[i]:
+            i += 1
+            continue
+        j = i
+        while j < len(pattern) and mask[j]:
+            j += 1
+        segments.append((i, pattern[i:j]))
+        i = j
+    # Prefer the longest run; among equals, the one with the fewest 00/CC/FF filler bytes
+    anchor_offset, anchor = max(segments, key=lambda s: (len(s[1]), -sum(b in (0x00, 0xCC, 0xFF) for b in s[1])))
+
+    last = len(pattern) - 1
+    last_wildcard = max((k for k in range(last) if not mask[k]), default=-1)
+    default_shift = last - last_wildcard if last_wildcard >= 0 else len(pattern)
+    skip = [default_shift] * 256
+    for k in range(last_wildcard + 1, last):
+        skip[pattern[k]] = last - k
+    return anchor, anchor_offset, tuple(segments), bytes(min(s, 255) for s in skip)
+
+
+def compile_signature(name, entry):
+    pattern, mask = parse_pattern(entry["pattern"])
+    anchor, anchor_offset, segments, skip = build_table(pattern, mask)
+    return Signature(name, entry.get("region", "module"), entry.get("offset", 0), len(pattern),
+                     pattern, mask, anchor, anchor_offset, segments, skip)
+
+
+def merged_entries(db, series):
+    entries = dict(db.get("common", {}))
+    if series != COMMON_SERIES:
+        entries.update(db.get("series", {}).get(series, {}))
+    return entries
+
+
+def database_digest(raw):
+    # Line endings differ between checkouts; hash the normalised text
+    return hashlib.sha1(raw.replace(b"\r\n", b"\n")).hexdigest()
+
+
+def _read_database(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _from_tables(rows):
+    return {name: Signature(name, *row) for name, row in rows.items()}
+
+
+_cache = {}
+
+
+def load_signatures(series=COMMON_SERIES):
+    if series in _cache:
+        return _cache[series]
+    db_path = resource_path(SIGNATURE_DB)
+    # Only the raw bytes are hashed; the JSON is parsed just when the generated tables do not match it
+    raw = _read_database(db_path) if os.path.exists(db_path) else None
+    try:
+        import signature_tables
+    except ImportError:
+        signature_tables = None
+
+    if signature_tables is not None and (raw is None or signature_tables.SOURCE_SHA1 == database_digest(raw)):
+        tables = signature_tables.TABLES.get(series) or signature_tables.TABLES[COMMON_SERIES]
+        signatures = _from_tables(tables)
+    elif raw is not None:
+        # Tables are missing or stale: compile from the JSON so an edited database still works
+        print("Signature tables out of date; run build_signatures.py")
+        db = json.loads(raw.decode("utf-8"))
+        signatures = {name: compile_signature(name, entry) for name, entry in merged_entries(db, series).items()}
+    else:
+        raise FileNotFoundError(f"No signature database found at {db_path}")
+    _cache[series] = signatures
+    return signatures
+
+
+def get_signature(name, series=COMMON_SERIES):
+    # None when the series has no such signature; callers treat that like a failed scan
+    return load_signatures(series).get(name)
+
+
+class SignatureScanner:
+    def __init__(self, signatures):
+        self.signatures = list(signatures.values()) if isinstance(signatures, dict) else list(signatures)
+
+    def resolve(self, data, limit=1, region=None):
+        # One pass per signature over a single shared buffer instead of one read per controller
+        results = {}
+        for signature in self.signatures:
+            if region is not None and signature.region != region:
+                continue
+            results[signature.name] = signature.scan(data, limit=limit)
+        return results
@@ -0,0 +1,378 @@
+import argparse
+import bisect
+import collections
+import ctypes
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+
+from heapscan import MEMORY_BASIC_INFORMATION, PAGE_READWRITE, USER_SPACE_END, walk_regions
+from peinfo import HEADER_READ_SIZE, PEFormatError, parse_headers
+from relocate import build_key
+from version_detector import PROCESS_NAME
+
+SNAPSHOT_MAGIC = b"TSNAP\x00\x00\x01"
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".tsnap"
+CHUNK_SIZE = 1 << 20
+CACHED_CHUNKS = 64
+FOOTER = struct.Struct("<Q8s")
+_ZEROS = memoryview(bytes(CHUNK_SIZE))
+
+# Chunk storage: raw bytes are served straight out of the mapping, deflated ones are inflated on first
+# touch, and all-zero chunks (most of an idle heap) take no space at all
+STORED = 0
+DEFLATED = 1
+ZERO = 2
+
+MEM_COMMIT = 0x1000
+PAGE_NOACCESS = 0x01
+PAGE_GUARD = 0x100
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class SnapshotRegion:
+    __slots__ = ("base", "size", "protect", "type", "allocation_base", "label", "chunks")
+
+    def __init__(self, base, size, protect, type, allocation_base, label, chunks):
+        self.base = base
+        self.size = size
+        self.protect = protect
+        self.type = type
+        self.allocation_base = allocation_base
+        self.label = label
+        self.chunks = chunks
+
+    @property
+    def end(self):
+        return self.base + self.size
+
+    def to_entry(self):
+        return {
+            "base": self.base,
+            "size": self.size,
+            "protect": self.protect,
+            "type": self.type,
+            "allocation_base": self.allocation_base,
+            "label": self.label,
+            "chunks": self.chunks,
+        }
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls(entry["base"], entry["size"], entry["protect"], entry["type"], entry["allocation_base"],
+                   entry["label"], [tuple(chunk) for chunk in entry["chunks"]])
+
+    def __repr__(self):
+        return f"SnapshotRegion({self.label}, 0x{self.base:X}, size=0x{self.size:X})"
+
+
+class SnapshotWriter:
+    # Layout: magic, chunk payloads in region order, JSON index, footer (index offset + magic).
+    # The file is written under a temporary name and only appears once the index is complete.
+    def __init__(self, path, level=1):
+        self.path = path
+        self.level = level
+        self.regions = []
+        self.metadata = {}
+        self.stored_bytes = 0
+        self.raw_bytes = 0
+        self._tmp_path = path + ".tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(SNAPSHOT_MAGIC)
+
+    def add_region(self, base, data, protect=PAGE_READWRITE, type=0, allocation_base=None, label="heap"):
+        view = memoryview(data)
+        chunks = []
+        for start in range(0, len(view), CHUNK_SIZE):
+            piece = view[start:start + CHUNK_SIZE]
+            if piece == _ZEROS[:len(piece)]:
+                chunks.append((ZERO, 0, len(piece)))
+                continue
+            packed = zlib.compress(piece, self.level) if self.level else None
+            offset = self._file.tell()
+            if packed is not None and len(packed) < len(piece) * 0.9:
+                self._file.write(packed)
+                chunks.append((DEFLATED, offset, len(packed)))
+            else:
+                self._file.write(piece)
+                chunks.append((STORED, offset, len(piece)))
+        self.raw_bytes += len(view)
+        self.regions.append(SnapshotRegion(base, len(view), protect, type, allocation_base or base, label, chunks))
+
+    def close(self, metadata=None):
+        index_offset = self._file.tell()
+        index = {
+            "format": SNAPSHOT_FORMAT,
+            "chunk_size": CHUNK_SIZE,
+            "metadata": metadata if metadata is not None else self.metadata,
+            "regions": [region.to_entry() for region in self.regions],
+        }
+        self._file.write(json.dumps(index).encode("utf-8"))
+        self._file.write(FOOTER.pack(index_offset, SNAPSHOT_MAGIC))
+        self.stored_bytes = self._file.tell()
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class Snapshot:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotError(f"{path} is empty")
+        if self._map[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or len(self._map) < FOOTER.size:
+            self.close()
+            raise SnapshotError(f"{path} is not a snapshot")
+        index_offset, magic = FOOTER.unpack_from(self._map, len(self._map) - FOOTER.size)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise SnapshotError(f"{path} is truncated")
+        index = json.loads(self._map[index_offset:len(self._map) - FOOTER.size].decode("utf-8"))
+        if index.get("format") != SNAPSHOT_FORMAT:
+            self.close()
+            raise SnapshotError(f"Unsupported snapshot format {index.get('format')}")
+        self.chunk_size = index["chunk_size"]
+        self.metadata = index["metadata"]
+        self.regions = sorted((SnapshotRegion.from_entry(entry) for entry in index["regions"]), key=lambda r: r.base)
+        self.bases = [region.base for region in self.regions]
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.inflated = 0
+
+    @property
+    def module_base(self):
+        return self.metadata.get("module_base")
+
+    @property
+    def module_size(self):
+        return self.metadata.get("module_size")
+
+    @property
+    def targets(self):
+        # name -> [addresses]; a value with several copies (brightness.gamma) has one entry per copy
+        return {name: value if isinstance(value, list) else [value]
+                for name, value in self.metadata.get("targets", {}).items()}
+
+    def region_at(self, address):
+        index = bisect.bisect_right(self.bases, address) - 1
+        if index >= 0 and address < self.regions[index].end:
+            return self.regions[index]
+        return None
+
+    def chunk(self, region, index):
+        method, offset, length = region.chunks[index]
+        if method == STORED:
+            return memoryview(self._map)[offset:offset + length]
+        key = (region.base, index)
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                return data
+        if method == ZERO:
+            data = bytes(length)
+        else:
+            data = zlib.decompress(self._map[offset:offset + length])
+            self.inflated += len(data)
+        with self._lock:
+            self._cache[key] = data
+            while len(self._cache) > CACHED_CHUNKS:
+                self._cache.popitem(last=False)
+        return data
+
+    def read_region(self, region, start=0, end=None):
+        end = region.size if end is None else min(end, region.size)
+        if start >= end:
+            return b""
+        first, last = start // self.chunk_size, (end - 1) // self.chunk_size
+        if first == last:
+            offset = start - first * self.chunk_size
+            return bytes(self.chunk(region, first)[offset:offset + end - start])
+        parts = []
+        for index in range(first, last + 1):
+            chunk_start = index * self.chunk_size
+            parts.append(self.chunk(region, index)[max(start, chunk_start) - chunk_start:min(end, chunk_start + self.chunk_size) - chunk_start])
+        return b"".join(parts)
+
+    def read(self, address, size):
+        region = self.region_at(address)
+        if region is None or address + size > region.end:
+            raise SnapshotError(f"0x{address:X} ({size} bytes) is not in the snapshot")
+        return self.read_region(region, address - region.base, address - region.base + size)
+
+    def read_bytes(self, address, length):
+        return self.read(address, length)
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A caller still holds a view of a stored chunk; the mapping goes away with it
+                pass
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def summary(self):
+        stored = os.path.getsize(self.path)
+        raw = sum(region.size for region in self.regions)
+        labels = collections.Counter(region.label for region in self.regions)
+        parts = ", ".join(f"{count} {label}" for label, count in sorted(labels.items()))
+        return f"{len(self.regions)} regions ({parts}), {raw / (1 << 20):.1f} MB in {stored / (1 << 20):.1f} MB"
+
+
+def _committed_regions(query, handle, start, end):
+    mbi = MEMORY_BASIC_INFORMATION()
+    address = start
+    regions = []
+    while address < end and query(handle, ctypes.c_void_p(address), ctypes.byref(mbi), ctypes.sizeof(mbi)):
+        if mbi.State == MEM_COMMIT and not mbi.Protect & (PAGE_NOACCESS | PAGE_GUARD) and mbi.Protect:
+            regions.append((mbi.BaseAddress, min(mbi.RegionSize, end - mbi.BaseAddress), mbi.Protect, mbi.Type,
+                            mbi.AllocationBase or mbi.BaseAddress))
+        address = mbi.BaseAddress + mbi.RegionSize
+        if address >= USER_SPACE_END:
+            break
+    return regions
+
+
+def capture(pm, path, heap=True, heap_limit=None, targets=None, series=None, level=1, process_name=PROCESS_NAME):
+    # Module image region by region (as VirtualQueryEx reports it), then the PAGE_READWRITE heap;
+    # heap_limit caps the heap bytes captured, taking regions in address order
+    import pymem.process
+
+    query = ctypes.windll.kernel32.VirtualQueryEx
+    module = pymem.process.module_from_name(pm.process_handle, process_name)
+    base = module.lpBaseOfDll
+    try:
+        headers = parse_headers(pm.read_bytes(base, HEADER_READ_SIZE))
+        module_size, build = headers.size_of_image, build_key(headers)
+    except PEFormatError:
+        module_size, build = module.SizeOfImage, None
+    started = time.perf_counter()
+    skipped = 0
+    with SnapshotWriter(path, level) as writer:
+        for region_base, size, protect, region_type, allocation_base in _committed_regions(query, pm.process_handle, base, base + module_size):
+            try:
+                writer.add_region(region_base, pm.read_bytes(region_base, size), protect, region_type, allocation_base, "module")
+            except Exception:
+                skipped += 1
+        if heap:
+            captured = 0
+            for region in walk_regions(query, pm.process_handle):
+                if base <= region.base < base + module_size:
+                    continue
+                if heap_limit is not None and captured + region.size > heap_limit:
+                    break
+                try:
+                    writer.add_region(region.base, pm.read_bytes(region.base, region.size), PAGE_READWRITE, 0,
+                                      region.allocation_base, "heap")
+                    captured += region.size
+                except Exception:
+                    skipped += 1
+        writer.metadata = {
+            "process": process_name,
+            "module_base": base,
+            "module_size": module_size,
+            "build": build,
+            "series": series,
+            "targets": targets or {},
+            "captured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "capture_seconds": round(time.perf_counter() - started, 3),
+            "skipped_regions": skipped,
+        }
+    return writer
+
+
+def _parse_target(text):
+    name, _, address = text.partition("=")
+    if not address:
+        raise argparse.ArgumentTypeError(f"expected NAME=ADDRESS, got {text!r}")
+    return name, int(address, 0)
+
+
+def target_map(pairs):
+    targets = {}
+    for name, address in pairs:
+        targets.setdefault(name, []).append(address)
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture the game's memory to a snapshot file, or describe one")
+    commands = parser.add_subparsers(dest="command", required=True)
+    capture_parser = commands.add_parser("capture", help="snapshot the running game")
+    capture_parser.add_argument("output", help=f"snapshot file ({SNAPSHOT_SUFFIX})")
+    capture_parser.add_argument("--no-heap", dest="heap", action="store_false", help="module image only")
+    capture_parser.add_argument("--heap-mb", type=int, help="cap on captured heap size")
+    capture_parser.add_argument("--level", type=int, default=1, help="zlib level, 0 stores every chunk raw")
+    capture_parser.add_argument("--target", action="append", type=_parse_target, default=[],
+                                help="NAME=ADDRESS to record, e.g. zoom.fov=0x1F00F797EF4; repeat a name for every copy")
+    info_parser = commands.add_parser("info", help="print a snapshot's region map")
+    info_parser.add_argument("snapshot")
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        import pymem
+        from version_detector import MinecraftVersionDetector
+
+        pm = pymem.Pymem(PROCESS_NAME)
+        series = MinecraftVersionDetector.parse_version(MinecraftVersionDetector.get_installed_version())
+        heap_limit = args.heap_mb << 20 if args.heap_mb else None
+        writer = capture(pm, args.output, args.heap, heap_limit, target_map(args.target), series, args.level)
+        print(f"Captured {len(writer.regions)} regions, {writer.raw_bytes / (1 << 20):.1f} MB "
+              f"in {writer.stored_bytes / (1 << 20):.1f} MB to {args.output}")
+        return 0
+
+    with Snapshot(args.snapshot) as snap:
+        meta = snap.metadata
+        print(f"{args.snapshot}: {snap.summary()}")
+        print(f"  build {meta.get('build')}  series {meta.get('series')}  captured {meta.get('captured_at')}")
+        for name, addresses in sorted(snap.targets.items()):
+            print(f"  target {name} = {', '.join(f'0x{address:X}' for address in addresses)}")
+        for region in snap.regions:
+            stored = sum(length for method, _, length in region.chunks if method != ZERO)
+            print(f"  {region.label:<7} 0x{region.base:016X} {region.size:>12,} bytes  protect 0x{region.protect:02X}  "
+                  f"stored {stored:>12,}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except (OSError, ValueError) as e:
+        print(f"Snapshot failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,131 @@
+import os
+import struct
+
+# Writes the minimal PE32 / PE32+ images used by test_peinfo.py. Run it again after changing a fixture:
+#   python tests/fixtures/build_fixtures.py
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FILE_ALIGNMENT = 0x200
+TEXT_RVA = 0x1000
+RSRC_RVA = 0x2000
+VS_FFI_SIGNATURE = 0xFEEF04BD
+
+
+def _pad4(data):
+    return data + b'\x00' * (-len(data) % 4)
+
+
+def _align(data, alignment=FILE_ALIGNMENT):
+    return data + b'\x00' * (-len(data) % alignment)
+
+
+def version_block(key, value=b'', value_type=0, value_length=None, children=()):
+    body = _pad4(b'\x00' * 6 + key.encode('utf-16-le') + b'\x00\x00') + value
+    for child in children:
+        body = _pad4(body) + child
+    if value_length is None:
+        value_length = len(value) // 2 if value_type == 1 else len(value)
+    return struct.pack('<HHH', len(body), value_length, value_type) + body[6:]
+
+
+def string_entry(name, text):
+    value = (text + '\x00').encode('utf-16-le')
+    return version_block(name, value, 1, len(text) + 1)
+
+
+def version_resource(file_version, product_version, strings):
+    def split(version):
+        a, b, c, d = (int(part) for part in version.split('.'))
+        return (a << 16) | b, (c << 16) | d
+    file_ms, file_ls = split(file_version)
+    product_ms, product_ls = split(product_version)
+    fixed = struct.pack('<13I', VS_FFI_SIGNATURE, 0x00010000, file_ms, file_ls, product_ms, product_ls,
+                        0x3F, 0, 0x40004, 1, 0, 0, 0)
+    table = version_block('040904B0', value_type=1, children=[string_entry(k, v) for k, v in strings.items()])
+    string_info = version_block('StringFileInfo', value_type=1, children=[table])
+    return version_block('VS_VERSION_INFO', fixed, 0, children=[string_info])
+
+
+def _directory(entries):
+    data = struct.pack('<IIHHHH', 0, 0, 0, 0, 0, len(entries))
+    for name, target in entries:
+        data += struct.pack('<II', name, target)
+    return data
+
+
+def resource_section(blob, cyclic=False):
+    # type (RT_VERSION) -> name 1 -> language 0x409 -> data entry; `cyclic` points the name level at itself
+    name_dir, lang_dir, data_entry, blob_offset = 0x18, 0x30, 0x48, 0x58
+    rsrc = _directory([(16, 0x80000000 | name_dir)])
+    rsrc += _directory([(1, 0x80000000 | (name_dir if cyclic else lang_dir))])
+    rsrc += _directory([(0x409, data_entry)])
+    rsrc += struct.pack('<IIII', RSRC_RVA + blob_offset, len(blob), 0, 0)
+    rsrc += b'\x00' * (blob_offset - len(rsrc))
+    return rsrc + blob
+
+
+def build_pe(pe32_plus, rsrc=None):
+    sections = [(b'.text', TEXT_RVA, b'\xC3' * 0x10, 0x60000020)]
+    if rsrc is not None:
+        sections.append((b'.rsrc', RSRC_RVA, rsrc, 0x40000040))
+    directories = [(0, 0)] * 16
+    if rsrc is not None:
+        directories[2] = (RSRC_RVA, len(rsrc))
+
+    if pe32_plus:
+        machine, magic, optional_size, directory_offset = 0x8664, 0x20B, 240, 108
+    else:
+        machine, magic, optional_size, directory_offset = 0x14C, 0x10B, 224, 92
+    size_of_image = RSRC_RVA + 0x1000
+    optional = bytearray(optional_size)
+    struct.pack_into('<H', optional, 0, magic)
+    struct.pack_into('<I', optional, 16, TEXT_RVA)
+    struct.pack_into('<II', optional, 32, 0x1000, FILE_ALIGNMENT)
+    struct.pack_into('<I', optional, 56, size_of_image)
+    struct.pack_into('<I', optional, 60, FILE_ALIGNMENT)
+    struct.pack_into('<I', optional, directory_offset, len(directories))
+    for i, (rva, size) in enumerate(directories):
+        struct.pack_into('<II', optional, directory_offset + 4 + i * 8, rva, size)
+
+    dos = bytearray(0x40)
+    dos[0:2] = b'MZ'
+    struct.pack_into('<I', dos, 0x3C, 0x40)
+    coff = struct.pack('<HHIIIHH', machine, len(sections), 0x5F000000, 0, 0, optional_size, 0x22)
+    headers = bytes(dos) + b'PE\x00\x00' + coff + bytes(optional)
+
+    raw_offset = FILE_ALIGNMENT
+    table = b''
+    for name, rva, data, characteristics in sections:
+        raw_size = len(_align(data))
+        table += struct.pack('<8sIIIIIIHHI', name, len(data), rva, raw_size, raw_offset, 0, 0, 0, 0, characteristics)
+        raw_offset += raw_size
+    image = _align(headers + table)
+    for _, _, data, _ in sections:
+        image += _align(data)
+    return image
+
+
+def fixtures():
+    strings = {"CompanyName": "Mojang", "FileVersion": "1.21.9301.0", "ProductVersion": "1.21.93.1"}
+    normal = version_resource("1.21.9301.0", "1.21.93.1", strings)
+    fixed_only = version_resource("1.21.11301.0", "1.21.113.1", {})
+    # VS_VERSION_INFO whose key runs to the end of its block without a terminator
+    unterminated = struct.pack('<HHH', 6 + 30, 0, 1) + 'VS_VERSION_INFO'.encode('utf-16-le')
+    return {
+        "pe32_version.exe": build_pe(False, resource_section(normal)),
+        "pe64_version.exe": build_pe(True, resource_section(fixed_only)),
+        "pe64_no_rsrc.exe": build_pe(True),
+        "pe32_unterminated_key.exe": build_pe(False, resource_section(unterminated)),
+        "pe64_cyclic_rsrc.exe": build_pe(True, resource_section(normal, cyclic=True)),
+    }
+
+
+def main():
+    for name, data in fixtures().items():
+        with open(os.path.join(HERE, name), 'wb') as f:
+            f.write(data)
+        print(f"{name}: {len(data)} bytes")
+
+
+if __name__ == "__main__":
+    main()
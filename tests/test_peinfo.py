@@ -0,0 +1,56 @@
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from peinfo import PEFormatError, parse_headers, parse_version_info, read_file_version, read_version_info
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture(name):
+    return os.path.join(FIXTURES, name)
+
+
+def test_pe32_version_resource():
+    info = read_version_info(fixture("pe32_version.exe"))
+    assert info["fixed"] == {"file_version": "1.21.9301.0", "product_version": "1.21.93.1"}
+    assert info["strings"] == {"CompanyName": "Mojang", "FileVersion": "1.21.9301.0", "ProductVersion": "1.21.93.1"}
+    assert read_file_version(fixture("pe32_version.exe")) == "1.21.93.1"
+
+
+def test_pe32_plus_falls_back_to_fixed_version():
+    with open(fixture("pe64_version.exe"), "rb") as f:
+        headers = parse_headers(f.read())
+    assert headers.is_pe32_plus
+    assert [section.name for section in headers.code_sections()] == [".text"]
+    assert read_version_info(fixture("pe64_version.exe"))["strings"] == {}
+    assert read_file_version(fixture("pe64_version.exe")) == "1.21.113.1"
+
+
+def test_no_resource_section():
+    assert read_version_info(fixture("pe64_no_rsrc.exe")) is None
+    assert read_file_version(fixture("pe64_no_rsrc.exe")) is None
+
+
+def test_unterminated_key_raises():
+    with pytest.raises(PEFormatError):
+        read_version_info(fixture("pe32_unterminated_key.exe"))
+
+
+def test_block_longer_than_blob_raises():
+    with pytest.raises(PEFormatError):
+        parse_version_info(struct.pack('<HHH', 100, 0, 1) + 'VS_VERSION_INFO'.encode('utf-16-le'))
+
+
+def test_cyclic_resource_directory_raises():
+    with pytest.raises(PEFormatError):
+        read_version_info(fixture("pe64_cyclic_rsrc.exe"))
+
+
+def test_not_a_pe():
+    with pytest.raises(PEFormatError):
+        parse_headers(b"\x7fELF" + bytes(0x100))
@@ -0,0 +1,121 @@
+import threading
+import time
+
+_NO_VALUE = object()
+
+
+class LatencyStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.last = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": (self.total / self.count * 1000) if self.count else 0.0,
+                "max_ms": self.max * 1000,
+                "last_ms": self.last * 1000,
+            }
+
+
+class WriteThrottle:
+    def __init__(self, write_fn, max_rate_hz=30, name=None):
+        self.write_fn = write_fn
+        self.min_interval = 1.0 / max_rate_hz
+        self.name = name or getattr(write_fn, "__name__", "write")
+        self.ui_latency = LatencyStats()
+        self.write_latency = LatencyStats()
+        self.submitted = 0
+        self.superseded = 0
+        self.written = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._pending = _NO_VALUE
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._last_write = 0.0
+        self._thread = None
+
+    def submit(self, value):
+        # Called from the Tk thread: only stores the value, the worker does the game write
+        with self._lock:
+            self.submitted += 1
+            if self._pending is not _NO_VALUE:
+                self.superseded += 1
+            self._pending = value
+            self._idle.clear()
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            delay = self._last_write + self.min_interval - time.perf_counter()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            with self._lock:
+                value = self._pending
+                self._pending = _NO_VALUE
+            if value is _NO_VALUE:
+                continue
+            start = time.perf_counter()
+            try:
+                ok = self.write_fn(value) is not False
+            except Exception as e:
+                ok = False
+                print(f"{self.name}: throttled write failed: {e}")
+            self._last_write = time.perf_counter()
+            self.write_latency.add(self._last_write - start)
+            if ok:
+                self.written += 1
+            else:
+                self.failed += 1
+            with self._lock:
+                if self._pending is _NO_VALUE:
+                    self._idle.set()
+
+    def flush(self, timeout=1.0):
+        return self._idle.wait(timeout)
+
+    def close(self):
+        # Pending values are discarded; callers restore game state themselves on shutdown
+        self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+        with self._lock:
+            self._pending = _NO_VALUE
+            self._idle.set()
+
+    def stats(self):
+        with self._lock:
+            counters = {
+                "submitted": self.submitted,
+                "superseded": self.superseded,
+                "written": self.written,
+                "failed": self.failed,
+            }
+        counters["ui_latency"] = self.ui_latency.snapshot()
+        counters["write_latency"] = self.write_latency.snapshot()
+        return counters
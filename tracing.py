@@ -0,0 +1,135 @@
+import functools
+import json
+import os
+import threading
+import time
+
+TRACE_FILE = "trace.json"
+MAX_EVENTS = 200000
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._complete(self.name, self.category, self.start, end, self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+    args = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    # Chrome trace-event recorder (chrome://tracing / Perfetto); spans are "X" complete events in microseconds
+    def __init__(self, enabled=False, max_events=MAX_EVENTS):
+        self.enabled = enabled
+        self.max_events = max_events
+        self.dropped = 0
+        self._origin = time.perf_counter()
+        self._events = []
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._events = []
+            self._threads = set()
+            self.dropped = 0
+            self._origin = time.perf_counter()
+
+    def span(self, name, category="attach", **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def instant(self, name, category="attach", **args):
+        if not self.enabled:
+            return
+        self._append({
+            "name": name, "cat": category, "ph": "i", "s": "t",
+            "ts": (time.perf_counter() - self._origin) * 1e6, "args": args,
+        })
+
+    def _complete(self, name, category, start, end, args):
+        self._append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6, "args": args,
+        })
+
+    def _append(self, event):
+        thread = threading.current_thread()
+        event["pid"] = self._pid
+        event["tid"] = thread.ident
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            if thread.ident not in self._threads:
+                # Metadata so the viewer labels rows with thread names instead of raw ids
+                self._threads.add(thread.ident)
+                self._events.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": thread.ident,
+                                     "args": {"name": thread.name}})
+            self._events.append(event)
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def dump(self, path=TRACE_FILE):
+        trace = {
+            "traceEvents": self.events(),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped": self.dropped},
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        os.replace(tmp_path, path)
+        return path
+
+
+tracer = Tracer(enabled=os.environ.get("TORIO_TRACE") == "1")
+
+
+def traced(name, controller=None, category="attach"):
+    # Method decorator: one span per call while tracing is on, a flag check otherwise
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with tracer.span(name, category, controller=controller):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
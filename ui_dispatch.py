@@ -0,0 +1,125 @@
+import collections
+import queue
+import threading
+import time
+
+
+class StatusRegistry:
+    def __init__(self):
+        self._handles = {}
+
+    def register(self, feature_name, status_label, switch, deselect_on_reset=False):
+        self._handles[feature_name] = (status_label, switch, deselect_on_reset)
+
+    def unregister(self, feature_name):
+        self._handles.pop(feature_name, None)
+
+    def __contains__(self, feature_name):
+        return feature_name in self._handles
+
+    def __len__(self):
+        return len(self._handles)
+
+    def dispatch(self, feature_name, message, color):
+        handle = self._handles.get(feature_name)
+        if handle is None:
+            return False
+        status_label, switch, deselect_on_reset = handle
+        status_label.configure(text=message, text_color=color)
+        if message == "Inactive" or (deselect_on_reset and message.startswith("Reset")):
+            switch.deselect()
+        elif message.startswith("Active"):
+            switch.select()
+        return True
+
+
+def coalesce_key(item):
+    # Events that only ever describe "current state" collapse onto one slot per key
+    kind = item[0]
+    if kind == 'status_update':
+        return (kind, item[1][0])
+    if kind in ('progress_update', 'status_text', 'diagnostics'):
+        return (kind,)
+    return None
+
+
+class CoalescingQueue:
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._order = collections.deque()
+        self._latest = {}
+        self.received = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.budget_exhausted = 0
+
+    def put(self, item, block=True, timeout=None):
+        with self._lock:
+            self.received += 1
+            if item is None:
+                self.dropped += 1
+                return
+            key = coalesce_key(item)
+            if key is not None and key in self._latest:
+                self._latest[key] = item
+                self.coalesced += 1
+                return
+            if self.maxsize > 0 and len(self._order) >= self.maxsize:
+                self.dropped += 1
+                return
+            if key is not None:
+                self._latest[key] = item
+            self._order.append((key, item))
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def get_nowait(self):
+        with self._lock:
+            if not self._order:
+                raise queue.Empty
+            key, item = self._order.popleft()
+            if key is not None:
+                item = self._latest.pop(key)
+            self.delivered += 1
+            return item
+
+    def qsize(self):
+        with self._lock:
+            return len(self._order)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def drain(self, handler, max_items=500, budget=0.008):
+        # Handles pending events until empty, max_items, or the time budget runs out;
+        # whatever is left waits for the next frame. handler returning False stops early.
+        deadline = time.perf_counter() + budget
+        handled = 0
+        while handled < max_items:
+            try:
+                item = self.get_nowait()
+            except queue.Empty:
+                return handled
+            handled += 1
+            if handler(item) is False:
+                return handled
+            if time.perf_counter() >= deadline:
+                break
+        if not self.empty():
+            with self._lock:
+                self.budget_exhausted += 1
+        return handled
+
+    def stats(self):
+        with self._lock:
+            return {
+                "received": self.received,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "delivered": self.delivered,
+                "pending": len(self._order),
+                "budget_exhausted": self.budget_exhausted,
+            }
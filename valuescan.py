@@ -0,0 +1,406 @@
+import argparse
+import ctypes
+import os
+import shlex
+import sys
+import tempfile
+import time
+
+from heapscan import PAGE_READWRITE, walk_regions
+from relocate import np
+from snapshot import Snapshot, SnapshotWriter
+
+VALUE_TYPES = {
+    "float": "<f4",
+    "double": "<f8",
+    "int": "<i4",
+    "uint": "<u4",
+    "long": "<i8",
+    "short": "<i2",
+    "byte": "u1",
+}
+RAW_TYPES = {1: "u1", 2: "<u2", 4: "<u4", 8: "<u8"}
+DEFAULT_TOLERANCE = 1e-4
+
+# name: (needs a value, needs the previous value)
+CONDITIONS = {
+    "changed": (0, True),
+    "unchanged": (0, True),
+    "increased": (0, True),
+    "decreased": (0, True),
+    "equal": (1, False),
+    "range": (2, False),
+    "unknown": (0, False),
+}
+
+
+class ValueScanError(ValueError):
+    pass
+
+
+class BufferSource:
+    # Regions held in memory: [(base, bytes-like)]; used by the benchmark and for already-loaded data
+    def __init__(self, regions):
+        self._regions = {base: data for base, data in regions}
+
+    def regions(self):
+        return [(base, len(data)) for base, data in sorted(self._regions.items())]
+
+    def read(self, base, size):
+        return self._regions[base][:size]
+
+    def freeze(self):
+        return BufferSource([(base, bytes(data)) for base, data in self._regions.items()])
+
+    def close(self):
+        pass
+
+
+class SnapshotSource:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot if isinstance(snapshot, Snapshot) else Snapshot(snapshot)
+        self._regions = {region.base: region for region in self.snapshot.regions if region.protect == PAGE_READWRITE}
+
+    def regions(self):
+        return [(base, region.size) for base, region in sorted(self._regions.items())]
+
+    def read(self, base, size):
+        return self.snapshot.read_region(self._regions[base], 0, size)
+
+    def freeze(self):
+        return self
+
+    def close(self):
+        self.snapshot.close()
+
+
+class ProcessSource:
+    def __init__(self, pm, query=None):
+        self.pm = pm
+        self.query = query or ctypes.windll.kernel32.VirtualQueryEx
+        self._temp = None
+
+    def regions(self):
+        return [(region.base, region.size) for region in walk_regions(self.query, self.pm.process_handle)]
+
+    def read(self, base, size):
+        return self.pm.read_bytes(base, size)
+
+    def freeze(self):
+        # An unknown-value first scan keeps every byte; it goes to an uncompressed snapshot on disk, not RAM
+        handle, path = tempfile.mkstemp(suffix=".tsnap")
+        os.close(handle)
+        with SnapshotWriter(path, level=0) as writer:
+            for base, size in self.regions():
+                try:
+                    writer.add_region(base, self.read(base, size), PAGE_READWRITE, label="heap")
+                except Exception:
+                    pass
+        source = SnapshotSource(path)
+        source.temp_path = path
+        return source
+
+    def close(self):
+        pass
+
+
+class ScanStep:
+    __slots__ = ("condition", "args", "before", "after", "elapsed", "bytes_scanned")
+
+    def __init__(self, condition, args, before, after, elapsed, bytes_scanned):
+        self.condition = condition
+        self.args = args
+        self.before = before
+        self.after = after
+        self.elapsed = elapsed
+        self.bytes_scanned = bytes_scanned
+
+    @property
+    def selectivity(self):
+        return self.after / self.before if self.before else 0.0
+
+    def as_dict(self):
+        return {
+            "condition": self.condition,
+            "args": list(self.args),
+            "before": self.before,
+            "after": self.after,
+            "selectivity": self.selectivity,
+            "elapsed": self.elapsed,
+            "bytes_scanned": self.bytes_scanned,
+        }
+
+    def __str__(self):
+        text = " ".join([self.condition] + [str(arg) for arg in self.args])
+        return (f"{text:<24} {self.before:>14,} -> {self.after:>14,}  ({self.selectivity:.2e})  "
+                f"{self.elapsed * 1000:9.1f} ms  {self.bytes_scanned / (1 << 20):9.1f} MB")
+
+
+class RegionCandidates:
+    # Element indices (uint32, one per aligned slot) and the value each had at the last step; None for
+    # both means "every slot", backed by the frozen baseline instead of an array
+    __slots__ = ("size", "indices", "values")
+
+    def __init__(self, size, indices=None, values=None):
+        self.size = size
+        self.indices = indices
+        self.values = values
+
+
+class ValueScanner:
+    def __init__(self, value_type="float", alignment=None, tolerance=DEFAULT_TOLERANCE):
+        if np is None:
+            raise ValueScanError("The value scanner needs numpy")
+        if value_type not in VALUE_TYPES:
+            raise ValueScanError(f"Unknown value type {value_type!r}; expected one of {', '.join(VALUE_TYPES)}")
+        self.value_type = value_type
+        self.dtype = np.dtype(VALUE_TYPES[value_type])
+        self.raw = np.dtype(RAW_TYPES[self.dtype.itemsize])
+        self.alignment = alignment or self.dtype.itemsize
+        self.tolerance = tolerance
+        self.regions = {}
+        self.baseline = None
+        self.history = []
+
+    @property
+    def count(self):
+        total = 0
+        for candidates in self.regions.values():
+            total += self._slots(candidates.size) if candidates.indices is None else len(candidates.indices)
+        return total
+
+    @property
+    def started(self):
+        return bool(self.history)
+
+    def _slots(self, size):
+        return max(0, (size - self.dtype.itemsize) // self.alignment + 1)
+
+    def _view(self, data, dtype):
+        slots = self._slots(len(data))
+        if self.alignment == dtype.itemsize:
+            return np.frombuffer(data, dtype=dtype, count=slots)
+        return np.ndarray((slots,), dtype=dtype, buffer=data, strides=(self.alignment,))
+
+    def _match(self, condition, args, current, previous, current_raw=None, previous_raw=None):
+        if condition == "unknown":
+            return np.ones(len(current), dtype=bool)
+        if condition == "equal":
+            if self.dtype.kind == "f":
+                return np.abs(current - args[0]) <= self.tolerance
+            return current == args[0]
+        if condition == "range":
+            return (current >= args[0]) & (current <= args[1])
+        # Bitwise for changed/unchanged so NaN == NaN and -0.0 != 0.0, the way memory editors compare
+        if condition == "changed":
+            return current_raw != previous_raw
+        if condition == "unchanged":
+            return current_raw == previous_raw
+        if condition == "increased":
+            return current > previous
+        if condition == "decreased":
+            return current < previous
+        raise ValueScanError(f"Unknown condition {condition!r}")
+
+    def _check(self, condition, args):
+        if condition not in CONDITIONS:
+            raise ValueScanError(f"Unknown condition {condition!r}; expected one of {', '.join(CONDITIONS)}")
+        arity, needs_previous = CONDITIONS[condition]
+        if len(args) != arity:
+            raise ValueScanError(f"{condition} takes {arity} value(s)")
+        if needs_previous and not self.started:
+            raise ValueScanError(f"{condition} needs an earlier scan to compare against")
+        try:
+            if self.dtype.kind == "f":
+                return tuple(float(arg) for arg in args)
+            # Base 0 so typed values accept 0x/0o/0b prefixes; int("3.5") fails here instead of truncating
+            return tuple(int(arg, 0) if isinstance(arg, str) else int(arg) for arg in args)
+        except (TypeError, ValueError):
+            raise ValueScanError(f"{condition} expects {self.value_type} value(s), got {' '.join(map(str, args))}") from None
+
+    def first_scan(self, source, condition="unknown", *args):
+        args = self._check(condition, args)
+        self.reset()
+        started = time.perf_counter()
+        before = scanned = 0
+        if condition == "unknown":
+            self.baseline = source.freeze()
+            for base, size in self.baseline.regions():
+                self.regions[base] = RegionCandidates(size)
+                before += self._slots(size)
+            scanned = sum(size for _, size in self.baseline.regions())
+            after = before
+        else:
+            after = 0
+            for base, size in source.regions():
+                try:
+                    data = source.read(base, size)
+                except Exception:
+                    continue
+                current = self._view(data, self.dtype)
+                before += len(current)
+                scanned += len(data)
+                hits = np.flatnonzero(self._match(condition, args, current, None)).astype(np.uint32)
+                if len(hits):
+                    self.regions[base] = RegionCandidates(size, hits, current[hits])
+                    after += len(hits)
+        step = ScanStep(condition, args, before, after, time.perf_counter() - started, scanned)
+        self.history.append(step)
+        return step
+
+    def next_scan(self, source, condition, *args):
+        args = self._check(condition, args)
+        started = time.perf_counter()
+        before = self.count
+        after = scanned = 0
+        live = dict(source.regions())
+        for base in list(self.regions):
+            candidates = self.regions[base]
+            # A region that was freed or resized is no longer the same allocation
+            if live.get(base) != candidates.size:
+                del self.regions[base]
+                continue
+            try:
+                data = source.read(base, candidates.size)
+            except Exception:
+                del self.regions[base]
+                continue
+            scanned += len(data)
+            current = self._view(data, self.dtype)
+            if candidates.indices is None:
+                previous_data = self.baseline.read(base, candidates.size)
+                previous = self._view(previous_data, self.dtype)
+                mask = self._match(condition, args, current, previous,
+                                   self._view(data, self.raw), self._view(previous_data, self.raw))
+                indices = np.flatnonzero(mask).astype(np.uint32)
+                values = current[indices]
+            else:
+                indices = candidates.indices
+                picked = current[indices]
+                mask = self._match(condition, args, picked, candidates.values,
+                                   picked.view(self.raw), candidates.values.view(self.raw))
+                indices = indices[mask]
+                values = picked[mask]
+            if len(indices):
+                self.regions[base] = RegionCandidates(candidates.size, indices, values)
+                after += len(indices)
+            else:
+                del self.regions[base]
+        self._release_baseline()
+        step = ScanStep(condition, args, before, after, time.perf_counter() - started, scanned)
+        self.history.append(step)
+        return step
+
+    def addresses(self, limit=None):
+        # (address, value at the last step); Python ints are only built for what is actually listed
+        results = []
+        for base in sorted(self.regions):
+            candidates = self.regions[base]
+            if candidates.indices is None:
+                continue
+            take = len(candidates.indices) if limit is None else min(len(candidates.indices), limit - len(results))
+            for index, value in zip(candidates.indices[:take].tolist(), candidates.values[:take].tolist()):
+                results.append((base + index * self.alignment, value))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def memory_bytes(self):
+        return sum(c.indices.nbytes + c.values.nbytes for c in self.regions.values() if c.indices is not None)
+
+    def _release_baseline(self):
+        if self.baseline is None or any(c.indices is None for c in self.regions.values()):
+            return
+        baseline, self.baseline = self.baseline, None
+        temp_path = getattr(baseline, "temp_path", None)
+        if temp_path:
+            baseline.close()
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def reset(self):
+        self.regions = {}
+        self.history = []
+        self._release_baseline()
+
+    def report(self):
+        lines = [f"{'step':<24} {'before':>14}    {'after':>14}  {'selectivity':>10}  {'time':>12}  {'read':>12}"]
+        lines.extend(str(step) for step in self.history)
+        lines.append(f"{self.count:,} candidates, {self.memory_bytes() / (1 << 20):.1f} MB of candidate arrays")
+        return "\n".join(lines)
+
+
+def _run_command(scanner, source, words):
+    condition, args = words[0], words[1:]
+    step = scanner.next_scan(source, condition, *args) if scanner.started else scanner.first_scan(source, condition, *args)
+    print(step)
+    for address, value in scanner.addresses(limit=10):
+        print(f"  0x{address:X} = {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Narrow down a value's address between scans of the game's writable memory")
+    parser.add_argument("--type", default="float", choices=sorted(VALUE_TYPES))
+    parser.add_argument("--alignment", type=int)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--snapshot", action="append", default=[],
+                        help="replay snapshot files (one per --step) instead of attaching to the game")
+    parser.add_argument("--step", action="append", default=[],
+                        help="scan to run, e.g. \"range 30 110\", \"changed\", \"equal 70\"; prompts when omitted")
+    args = parser.parse_args()
+    scanner = ValueScanner(args.type, args.alignment, args.tolerance)
+
+    if args.snapshot:
+        if len(args.snapshot) != len(args.step):
+            raise ValueScanError("give one --step per --snapshot")
+        sources = [SnapshotSource(path) for path in args.snapshot]
+        try:
+            for source, step in zip(sources, args.step):
+                _run_command(scanner, source, shlex.split(step))
+            print(scanner.report())
+        finally:
+            scanner.reset()
+            for source in sources:
+                source.close()
+        return 0
+
+    import pymem
+    from version_detector import PROCESS_NAME
+
+    source = ProcessSource(pymem.Pymem(PROCESS_NAME))
+    steps = list(args.step)
+    while True:
+        if steps:
+            line = steps.pop(0)
+        else:
+            try:
+                line = input("scan> ").strip()
+            except EOFError:
+                break
+        words = shlex.split(line)
+        if not words:
+            continue
+        if words[0] in ("quit", "exit"):
+            break
+        if words[0] == "report":
+            print(scanner.report())
+            continue
+        if words[0] == "reset":
+            scanner.reset()
+            continue
+        try:
+            _run_command(scanner, source, words)
+        except ValueScanError as e:
+            print(e)
+    print(scanner.report())
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except (OSError, ValueError) as e:
+        print(f"Value scan failed: {e}")
+        sys.exit(1)
@@ -1,143 +1,207 @@
-import subprocess
-import json
-import re
-from subprocess import CREATE_NO_WINDOW
-
-class MinecraftVersionDetector:
-    SUPPORTED_VERSION_SERIES = {
-        "1.21.12": {
-            "speed_pattern": b'\xF3\x0F\x10\x01\xF3\x0F\x11\x44\x24\x20\xC6',
-            "speed_original_length": 10,
-           
-            "hitbox_pattern": b'\xF3\x0F\x10\x79\x18\x49',
-            "shadow_pattern": b'\xF3\x44\x0F\x11\x42\x10',
-            "shadow_value_on": 0.6,
-            "shadow_value_off": 0.6,
-            "shadow_patch_length": 6,
-           
-            "series": "1.21.12"
-        },
-        "1.21.13": {
-            "speed_pattern": b'\xF3\x0F\x10\x40\x7C\xF3\x0F\x11\x44\x24\x28',
-            "speed_original_length": 11,
-           
-            "hitbox_pattern": b'\xF3\x0F\x10\x40\x18\x48\x83\xC4\x20',
-            "shadow_pattern": b'\xF3\x44\x0F\x11\x42\x10',
-            "shadow_value_on": 0.6,
-            "shadow_value_off": 0.6,
-            "shadow_patch_length": 6,
-           
-            "series": "1.21.13"
-        }
-    }
-    
-    @staticmethod
-    def get_installed_version():
-        powershell_command = (
-            'Get-AppxPackage -Name "Microsoft.MinecraftUWP" | '
-            'Select-Object Version | '
-            'ConvertTo-Json'
-        )
-        
-        try:
-            result = subprocess.run(
-                ["powershell", "-Command", powershell_command],
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8',
-                timeout=10,
-                creationflags=CREATE_NO_WINDOW
-            )
-            
-            json_output = result.stdout.strip()
-            
-            if not json_output:
-                return None
-            
-            packages = json.loads(json_output)
-            if not isinstance(packages, list):
-                packages = [packages]
-            
-            for package in packages:
-                if 'Version' in package:
-                    return package['Version']
-            
-            return None
-            
-        except subprocess.TimeoutExpired:
-            print("PowerShell command timed out")
-            return None
-        except subprocess.CalledProcessError as e:
-            print(f"PowerShell execution error: {e.stderr.strip()}")
-            return None
-        except json.JSONDecodeError:
-            print("Invalid JSON output from PowerShell")
-            return None
-        except Exception as e:
-            print(f"Error detecting Minecraft version: {e}")
-            return None
-    
-    @staticmethod
-    def parse_version(version_string):
-        if not version_string:
-            return None
-        match = re.match(r'(\d+)\.(\d+)\.(\d+)', version_string)
-        if match:
-            major = match.group(1)
-            minor = match.group(2)
-            patch = match.group(3)[:2]
-            return f"{major}.{minor}.{patch}"
-        
-        return None
-    
-    @classmethod
-    def is_version_supported(cls, version_string):
-        series_version = cls.parse_version(version_string)
-        
-        if not series_version:
-            return False, None, None
-        
-        if series_version in cls.SUPPORTED_VERSION_SERIES:
-            return True, series_version, cls.SUPPORTED_VERSION_SERIES[series_version]
-        
-        return False, series_version, None
-    
-    @classmethod
-    def get_version_config(cls, version_string):
-        _, _, config = cls.is_version_supported(version_string)
-        return config
-    
-    @classmethod
-    def check_compatibility(cls):
-        installed = cls.get_installed_version()
-        
-        if not installed:
-            return {
-                'installed_version': None,
-                'series_version': None,
-                'supported': False,
-                'config': None,
-                'message': 'Minecraft Bedrock Edition not found'
-            }
-        
-        supported, series_version, config = cls.is_version_supported(installed)
-        
-        display_version = installed
-        version_match = re.match(r'(\d+\.\d+\.\d{3})', installed)
-        if version_match:
-            display_version = version_match.group(1)
-        
-        if supported:
-            message = f"Compatible: {display_version}"
-        else:
-            supported_list = ', '.join([f"{s}0" for s in cls.SUPPORTED_VERSION_SERIES.keys()])
-            message = f"Unsupported: {display_version}. Supported: {supported_list}"
-        
-        return {
-            'installed_version': display_version,
-            'series_version': series_version,
-            'supported': supported,
-            'config': config,
-            'message': message
+import subprocess
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+import peinfo
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+PROCESS_NAME = "Minecraft.Windows.exe"
+PACKAGE_NAME = "Microsoft.MinecraftUWP"
+
+class MinecraftVersionDetector:
+    SUPPORTED_VERSION_SERIES = {
+        "1.21.12": {
+            "speed_original_length": 10,
+           
+            "shadow_value_on": 0.6,
+            "shadow_value_off": 0.6,
+            "shadow_patch_length": 6,
+           
+            "series": "1.21.12"
+        },
+        "1.21.13": {
+            "speed_original_length": 11,
+           
+            "shadow_value_on": 0.6,
+            "shadow_value_off": 0.6,
+            "shadow_patch_length": 6,
+           
+            "series": "1.21.13"
+        }
+    }
+    
+    # (path, mtime) -> version string or None; install location remembered from the last PowerShell run
+    _version_cache = {}
+    _install_location = None
+
+    @staticmethod
+    def find_running_executable():
+        if psutil is None:
+            return None
+        try:
+            for proc in psutil.process_iter(['name', 'exe']):
+                if (proc.info['name'] or '').lower() == PROCESS_NAME.lower() and proc.info['exe']:
+                    return proc.info['exe']
+        except Exception:
+            pass
+        return None
+
+    @staticmethod
+    def read_manifest_version(manifest_path):
+        root = ET.parse(manifest_path).getroot()
+        for element in root.iter():
+            if element.tag.rsplit('}', 1)[-1] == 'Identity' and element.get('Name') == PACKAGE_NAME:
+                return element.get('Version')
+        return None
+
+    @classmethod
+    def _read_cached(cls, path, reader):
+        try:
+            key = (os.path.normcase(path), os.path.getmtime(path))
+        except OSError:
+            return None
+        if key not in cls._version_cache:
+            try:
+                cls._version_cache[key] = reader(path)
+            except (OSError, ValueError, ET.ParseError) as e:
+                print(f"Failed to read version from {path}: {e}")
+                cls._version_cache[key] = None
+        return cls._version_cache[key]
+
+    @classmethod
+    def get_installed_version(cls):
+        locations = []
+        exe_path = cls.find_running_executable()
+        if exe_path:
+            locations.append(os.path.dirname(exe_path))
+        if cls._install_location and cls._install_location not in locations:
+            locations.append(cls._install_location)
+
+        for location in locations:
+            version = cls._read_cached(os.path.join(location, "AppxManifest.xml"), cls.read_manifest_version)
+            if version:
+                return version
+            version = cls._read_cached(os.path.join(location, PROCESS_NAME), peinfo.read_file_version)
+            if version:
+                return version
+
+        return cls.get_installed_version_powershell()
+
+    @classmethod
+    def get_installed_version_powershell(cls):
+        powershell_command = (
+            f'Get-AppxPackage -Name "{PACKAGE_NAME}" | '
+            'Select-Object Version, InstallLocation | '
+            'ConvertTo-Json'
+        )
+        
+        try:
+            result = subprocess.run(
+                ["powershell", "-Command", powershell_command],
+                capture_output=True,
+                text=True,
+                check=True,
+                encoding='utf-8',
+                timeout=10,
+                creationflags=CREATE_NO_WINDOW
+            )
+            
+            json_output = result.stdout.strip()
+            
+            if not json_output:
+                return None
+            
+            packages = json.loads(json_output)
+            if not isinstance(packages, list):
+                packages = [packages]
+            
+            for package in packages:
+                if 'Version' in package:
+                    if package.get('InstallLocation'):
+                        cls._install_location = package['InstallLocation']
+                    return package['Version']
+            
+            return None
+            
+        except subprocess.TimeoutExpired:
+            print("PowerShell command timed out")
+            return None
+        except subprocess.CalledProcessError as e:
+            print(f"PowerShell execution error: {e.stderr.strip()}")
+            return None
+        except json.JSONDecodeError:
+            print("Invalid JSON output from PowerShell")
+            return None
+        except Exception as e:
+            print(f"Error detecting Minecraft version: {e}")
+            return None
+    
+    @staticmethod
+    def parse_version(version_string):
+        if not version_string:
+            return None
+        match = re.match(r'(\d+)\.(\d+)\.(\d+)', version_string)
+        if match:
+            major = match.group(1)
+            minor = match.group(2)
+            patch = match.group(3)[:2]
+            return f"{major}.{minor}.{patch}"
+        
+        return None
+    
+    @classmethod
+    def is_version_supported(cls, version_string):
+        series_version = cls.parse_version(version_string)
+        
+        if not series_version:
+            return False, None, None
+        
+        if series_version in cls.SUPPORTED_VERSION_SERIES:
+            return True, series_version, cls.SUPPORTED_VERSION_SERIES[series_version]
+        
+        return False, series_version, None
+    
+    @classmethod
+    def get_version_config(cls, version_string):
+        _, _, config = cls.is_version_supported(version_string)
+        return config
+    
+    @classmethod
+    def check_compatibility(cls):
+        installed = cls.get_installed_version()
+        
+        if not installed:
+            return {
+                'installed_version': None,
+                'series_version': None,
+                'supported': False,
+                'config': None,
+                'message': 'Minecraft Bedrock Edition not found'
+            }
+        
+        supported, series_version, config = cls.is_version_supported(installed)
+        
+        display_version = installed
+        version_match = re.match(r'(\d+\.\d+\.\d{3})', installed)
+        if version_match:
+            display_version = version_match.group(1)
+        
+        if supported:
+            message = f"Compatible: {display_version}"
+        else:
+            supported_list = ', '.join([f"{s}0" for s in cls.SUPPORTED_VERSION_SERIES.keys()])
+            message = f"Unsupported: {display_version}. Supported: {supported_list}"
+        
+        return {
+            'installed_version': display_version,
+            'series_version': series_version,
+            'supported': supported,
+            'config': config,
+            'message': message
         }
\ No newline at end of file